@@ -7,6 +7,12 @@ PCComponentes - Product Discovery Tool
 
 import streamlit as st
 import html
+import hashlib
+import time
+import string
+from concurrent.futures import ThreadPoolExecutor, Future
+from types import SimpleNamespace
+from typing import Optional
 
 # Configuración de página (DEBE ser lo primero)
 st.set_page_config(
@@ -17,13 +23,15 @@ st.set_page_config(
 )
 
 # Imports
-from modules.google_trends import GoogleTrendsModule, calculate_growth_rate, calculate_seasonality
+from modules.google_trends import (
+    GoogleTrendsModule, calculate_growth_rate, calculate_seasonality, extract_timeline_values
+)
 from modules.related_queries import RelatedQueriesModule
 from modules.serp_paa import PeopleAlsoAskModule
 from modules.google_news import GoogleNewsModule
 from modules.product_analysis import ProductAnalyzer
 from modules.scoring import ScoringEngine
-from modules.ai_analysis import AIAnalyzer, render_provider_selector
+from modules.ai_analysis import get_ai_provider_info, render_provider_selector
 from modules.aliexpress import get_aliexpress_module, check_aliexpress_config
 from modules.youtube import get_youtube_module, check_youtube_config
 from modules.social_score import get_social_score_calculator
@@ -56,6 +64,7 @@ from utils import (
     init_session_state, add_to_history, render_search_history,
     render_empty_state, render_loading_state, sanitize_html, sanitize_for_query
 )
+from utils.http_client import get_http_session
 
 
 # ============================================
@@ -117,6 +126,344 @@ def preview_badge(text: str, variant: str = "gold") -> str:
     return f'<span class="{css_class}">{sanitize_html(text)}</span>'
 
 
+# Plantilla de la tarjeta del análisis IA (se compila una vez al cargar el módulo)
+_AI_CARD = string.Template('''
+    <div style="background: linear-gradient(135deg, #EDE9FE 0%, #FFFFFF 100%);
+    border-radius: 12px; padding: 24px; border-left: 4px solid #7C3AED;
+    margin-bottom: 16px;">
+        <div style="display: flex; align-items: center; gap: 8px; margin-bottom: 12px;">
+            <span style="font-size: 1.25rem;">🧠</span>
+            <span style="font-weight: 600; color: #5B21B6;">
+                Análisis ($provider)
+            </span>
+        </div>
+        <div style="color: #374151; line-height: 1.6;">
+            $text
+        </div>
+    </div>
+    ''')
+
+
+def ai_analysis_card(provider_name: str, analysis_html: str) -> str:
+    """
+    Genera HTML de la tarjeta del análisis IA
+
+    Args:
+        provider_name: Nombre del proveedor (ya sanitizado)
+        analysis_html: Texto del análisis (ya sanitizado)
+
+    Returns:
+        HTML string de la tarjeta
+    """
+    return _AI_CARD.substitute(provider=provider_name, text=analysis_html)
+
+
+def render_blog_ideas(blog_ideas: list):
+    """
+    Renderiza las ideas de blog generadas por IA
+
+    Args:
+        blog_ideas: Lista de ideas (dicts con titulo, enfoque, keywords_objetivo)
+    """
+    if not blog_ideas:
+        return
+
+    st.markdown("#### 📝 Ideas para el blog")
+
+    for i, idea in enumerate(blog_ideas[:5]):
+        if not isinstance(idea, dict):
+            continue
+        titulo = sanitize_html(idea.get('titulo', f'Idea {i+1}'))
+        with st.expander(f"💡 {titulo}"):
+            enfoque = sanitize_html(idea.get('enfoque', 'N/A'))
+            st.markdown(f"**Enfoque:** {enfoque}")
+            keywords = idea.get('keywords_objetivo', [])
+            if keywords and isinstance(keywords, list):
+                st.markdown(f"**Keywords:** {', '.join(map(sanitize_html, keywords[:10]))}")
+
+
+# ============================================
+# Data Fetching
+# ============================================
+
+# Consultas (SerpAPI + explicación IA) que se lanzan en paralelo en el modo Deep Dive
+DEEP_DIVE_MAX_WORKERS = 7
+
+# Peticiones HTTP simultáneas de un análisis: las consultas del Deep Dive más
+# el pool anidado de comparaciones de productos (dimensiona la sesión compartida)
+HTTP_CONNECTIONS_PER_ANALYSIS = DEEP_DIVE_MAX_WORKERS + ProductAnalyzer.MAX_CONCURRENT_REQUESTS
+
+# TTL de caché (segundos) de las respuestas de APIs externas
+CACHE_TTL_DEFAULT = 3600
+CACHE_TTL_NEWS = 600
+CACHE_TTL_COUNTRIES = 86400
+
+# Análisis completos guardados en session_state (por sesión)
+ANALYSIS_CACHE_MAX = 5
+
+
+def hash_api_key(api_key: str) -> str:
+    """
+    Hash corto de una API key para usarlo como parte de la clave de caché
+
+    Así las respuestas de distintas keys no se mezclan y la key en claro
+    nunca se guarda en la caché.
+    """
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class _FetchFailed(Exception):
+    """Respuesta fallida de una API; se lanza para que st.cache_data no la guarde"""
+
+    def __init__(self, result: dict):
+        super().__init__(result.get("error", "Error desconocido"))
+        self.result = result
+
+
+def _cacheable(result: dict) -> dict:
+    """
+    Devuelve el resultado solo si la consulta fue correcta
+
+    Los módulos capturan sus errores y devuelven {"success": False, ...};
+    st.cache_data guardaría ese dict como cualquier otro (un timeout o un 429
+    se serviría a todas las sesiones hasta que expire el TTL). Lanzando una
+    excepción no se cachea y el llamador recupera el dict de error.
+    """
+    if not result.get("success"):
+        raise _FetchFailed(result)
+    return result
+
+
+# Los módulos se pasan con prefijo "_" para que Streamlit no los incluya en
+# la clave de caché; api_key_hash identifica la cuenta de SerpAPI usada.
+# Solo se cachean respuestas correctas (ver _cacheable). refresh_nonce también
+# forma parte de la clave: "Refrescar datos" usa uno nuevo para saltarse la
+# caché solo en la búsqueda actual, sin vaciarla para el resto de usuarios.
+
+@st.cache_data(ttl=CACHE_TTL_DEFAULT, show_spinner=False)
+def fetch_trends(_trends_module, api_key_hash: str, keyword: str, geo: str, timeframe: str,
+                 category: int, exact_match: bool, refresh_nonce: int = 0) -> dict:
+    """Interés a lo largo del tiempo (cacheado)"""
+    return _cacheable(_trends_module.get_interest_over_time(
+        keyword=keyword,
+        geo=geo,
+        timeframe=timeframe,
+        category=category,
+        exact_match=exact_match
+    ))
+
+
+@st.cache_data(ttl=CACHE_TTL_DEFAULT, show_spinner=False)
+def fetch_related(_related_module, api_key_hash: str, keyword: str, geo: str, timeframe: str,
+                  refresh_nonce: int = 0) -> dict:
+    """Queries y topics relacionados (cacheado)"""
+    return _cacheable(_related_module.get_all_related(keyword=keyword, geo=geo, timeframe=timeframe))
+
+
+@st.cache_data(ttl=CACHE_TTL_DEFAULT, show_spinner=False)
+def fetch_paa_categories(_paa_module, api_key_hash: str, keyword: str, geo: str,
+                         refresh_nonce: int = 0) -> dict:
+    """Búsquedas relacionadas categorizadas (cacheado)"""
+    return _cacheable(_paa_module.categorize_searches(keyword=keyword, country=geo))
+
+
+@st.cache_data(ttl=CACHE_TTL_DEFAULT, show_spinner=False)
+def fetch_paa_questions(_paa_module, api_key_hash: str, keyword: str, geo: str,
+                        refresh_nonce: int = 0) -> dict:
+    """Preguntas PAA expandidas (cacheado)"""
+    return _cacheable(_paa_module.get_expanded_questions(
+        keyword=keyword,
+        country=geo,
+        max_depth=2,
+        max_questions=25
+    ))
+
+
+@st.cache_data(ttl=CACHE_TTL_NEWS, show_spinner=False)
+def fetch_news(_news_module, api_key_hash: str, keyword: str, geo: str, refresh_nonce: int = 0) -> dict:
+    """Noticias de Google News (cacheado con TTL corto)"""
+    return _cacheable(_news_module.search_news(query=keyword, country=geo))
+
+
+@st.cache_data(ttl=CACHE_TTL_DEFAULT, show_spinner=False)
+def fetch_products(_product_analyzer, api_key_hash: str, keyword: str, related_queries: list,
+                   geo: str, timeframe: str, refresh_nonce: int = 0) -> dict:
+    """Análisis completo de productos de la marca (cacheado)"""
+    return _cacheable(_product_analyzer.full_analysis(
+        brand=keyword,
+        related_queries=related_queries,
+        geo=geo,
+        timeframe=timeframe
+    ))
+
+
+@st.cache_data(ttl=CACHE_TTL_COUNTRIES, show_spinner=False)
+def fetch_multi_country(_trends_module, api_key_hash: str, keyword: str, countries: tuple, timeframe: str,
+                        refresh_nonce: int = 0) -> dict:
+    """Tendencia por países (cacheado con TTL largo, solo si respondieron todos los países)"""
+    result = _cacheable(_trends_module.get_multi_country_data(
+        keyword=keyword,
+        countries=list(countries),
+        timeframe=timeframe
+    ))
+
+    # Un país fallido no debe quedarse 24h en la caché
+    if not all(data.get("success") for data in result.get("countries", {}).values()):
+        raise _FetchFailed(result)
+
+    return result
+
+
+@st.cache_resource(show_spinner=False)
+def get_modules(api_key_hash: str, _api_key: str) -> SimpleNamespace:
+    """
+    Construye los módulos de análisis una sola vez por API key
+
+    Se reutilizan entre reruns y sesiones en lugar de instanciarlos en cada
+    interacción con la UI.
+
+    Args:
+        api_key_hash: Hash de la API key de SerpAPI (clave de caché)
+        _api_key: API key de SerpAPI (excluida del hash)
+
+    Returns:
+        Namespace con trends, related, paa, news, products, scoring y ai
+    """
+    # Todos los módulos SerpAPI comparten sesión HTTP (reutiliza conexiones TLS)
+    session = get_http_session(HTTP_CONNECTIONS_PER_ANALYSIS)
+
+    return SimpleNamespace(
+        trends=GoogleTrendsModule(_api_key, session=session),
+        related=RelatedQueriesModule(_api_key, session=session),
+        paa=PeopleAlsoAskModule(_api_key, session=session),
+        news=GoogleNewsModule(_api_key, session=session),
+        products=ProductAnalyzer(_api_key, session=session),
+        scoring=ScoringEngine(),
+        ai=get_ai_provider_info()[0]
+    )
+
+
+def _fetch_result(future: Future) -> dict:
+    """Resultado de un fetch cacheado; si la API falló, su dict de error"""
+    try:
+        return future.result()
+    except _FetchFailed as e:
+        return e.result
+
+
+def _future_result(future: Future):
+    """Devuelve el resultado de un future o la excepción que lanzó"""
+    try:
+        return _fetch_result(future)
+    except Exception as e:
+        return e
+
+
+def _analyze_products(product_analyzer, api_key_hash: str, related_future: Future,
+                      keyword: str, geo: str, timeframe: str, refresh_nonce: int = 0) -> dict:
+    """Análisis de productos encadenado a las related queries (las necesita como entrada)"""
+    related_data = _fetch_result(related_future)
+    queries = related_data.get("queries", {})
+
+    # Combinar queries rising y top para detección (sin duplicados, rising primero)
+    all_related_queries = product_analyzer.merge_related_queries(
+        queries.get("rising", []), queries.get("top", [])
+    )
+
+    return fetch_products(
+        product_analyzer, api_key_hash, keyword, all_related_queries, geo, timeframe, refresh_nonce
+    )
+
+
+def _explain_seasonality(ai_analyzer, trends_future: Future, keyword: str, ai_provider: str) -> Optional[str]:
+    """Explicación IA de estacionalidad encadenada a Google Trends (solo necesita el timeline)"""
+    trends_data = _fetch_result(trends_future)
+    timeline_data = trends_data.get("timeline_data", []) if trends_data.get("success") else []
+    if not timeline_data:
+        return None
+
+    return ai_analyzer.explain_seasonality(
+        seasonality_data=calculate_seasonality(timeline_data),
+        brand=keyword,
+        provider=ai_provider
+    )
+
+
+def fetch_deep_dive_data(
+    mods: SimpleNamespace,
+    api_key_hash: str,
+    keyword: str,
+    geo: str,
+    timeframe: str,
+    category: int,
+    exact_match: bool,
+    ai_provider: Optional[str] = None,
+    refresh_nonce: int = 0
+) -> dict:
+    """
+    Lanza en paralelo todas las consultas a SerpAPI del modo Deep Dive
+
+    Las consultas son independientes entre sí (salvo productos, que espera a
+    las related queries), así que el tiempo total pasa a ser el de la
+    consulta más lenta en lugar de la suma de todas. Cada consulta pasa por
+    su wrapper cacheado, por lo que repetir una keyword no toca la red.
+
+    La explicación IA de estacionalidad arranca en cuanto llega Google Trends
+    y queda oculta bajo el resto de consultas.
+
+    Args:
+        mods: Módulos devueltos por get_modules()
+        ai_provider: Proveedor IA para la explicación de estacionalidad
+            (None para no generarla)
+        refresh_nonce: Parte de la clave de caché; uno nuevo fuerza a
+            consultar de nuevo las APIs
+
+    Returns:
+        Dict con el resultado de cada consulta, o la excepción que lanzó
+    """
+    with ThreadPoolExecutor(max_workers=DEEP_DIVE_MAX_WORKERS) as executor:
+        futures = {
+            "trends": executor.submit(
+                fetch_trends, mods.trends, api_key_hash, keyword, geo, timeframe, category, exact_match,
+                refresh_nonce
+            ),
+            "related": executor.submit(
+                fetch_related, mods.related, api_key_hash, keyword, geo, timeframe, refresh_nonce
+            ),
+            "paa": executor.submit(
+                fetch_paa_categories, mods.paa, api_key_hash, keyword, geo, refresh_nonce
+            ),
+            "questions": executor.submit(
+                fetch_paa_questions, mods.paa, api_key_hash, keyword, geo, refresh_nonce
+            ),
+            "news": executor.submit(
+                fetch_news, mods.news, api_key_hash, keyword, geo, refresh_nonce
+            )
+        }
+        futures["products"] = executor.submit(
+            _analyze_products, mods.products, api_key_hash, futures["related"], keyword, geo, timeframe,
+            refresh_nonce
+        )
+        if ai_provider:
+            futures["seasonality_explanation"] = executor.submit(
+                _explain_seasonality, mods.ai, futures["trends"], keyword, ai_provider
+            )
+
+        return {name: _future_result(future) for name, future in futures.items()}
+
+
+def store_analysis(analysis_cache: dict, analysis_key: tuple, bundle: dict) -> None:
+    """
+    Guarda un análisis completo en la caché de sesión
+
+    Se mantienen como mucho ANALYSIS_CACHE_MAX análisis; al superarlo se
+    descarta el más antiguo.
+    """
+    analysis_cache[analysis_key] = bundle
+    while len(analysis_cache) > ANALYSIS_CACHE_MAX:
+        analysis_cache.pop(next(iter(analysis_cache)))
+
+
 def main():
     """Función principal de la aplicación"""
 
@@ -124,6 +471,9 @@ def main():
     load_css()
     init_session_state()
 
+    # Proveedores IA (detectados una vez por proceso)
+    _, ai_providers = get_ai_provider_info()
+
     # Sidebar
     with st.sidebar:
         render_logo()
@@ -169,6 +519,7 @@ def main():
         st.info("Ve a Settings > Secrets y añade: SERPAPI_KEY = 'tu_api_key'")
         return
 
+    # Única lectura de la key en el rerun: se reutiliza en módulos y gráficos
     serpapi_key = st.secrets.get("SERPAPI_KEY", "")
     geo = st.session_state.get("selected_country", "ES")
 
@@ -358,137 +709,206 @@ def main():
 
     # Análisis
     keyword_display = sanitize_html(keyword)
-    st.markdown(f"## 📊 Análisis: **{keyword_display}**")
+    col_title, col_refresh = st.columns([5, 1])
+
+    with col_title:
+        st.markdown(f"## 📊 Análisis: **{keyword_display}**")
+
+    with col_refresh:
+        refresh_clicked = st.button(
+            "🔄 Refrescar datos",
+            help="Vuelve a consultar todas las APIs ignorando la caché",
+            use_container_width=True
+        )
 
-    # Inicializar módulos
+    # Inicializar módulos (cacheados entre reruns)
+    api_key_hash = hash_api_key(serpapi_key)
     try:
-        serpapi_key = st.secrets.get("SERPAPI_KEY", "")
-        trends_module = GoogleTrendsModule(serpapi_key)
-        related_module = RelatedQueriesModule(serpapi_key)
-        paa_module = PeopleAlsoAskModule(serpapi_key)
-        news_module = GoogleNewsModule(serpapi_key)
-        product_analyzer = ProductAnalyzer(serpapi_key)
-        scoring_engine = ScoringEngine()
-        ai_analyzer = AIAnalyzer()
+        mods = get_modules(api_key_hash, serpapi_key)
     except Exception as e:
         st.error(f"Error inicializando módulos: {sanitize_html(str(e))}")
         return
 
-    # Obtener datos
-    with st.spinner("🔮 Consultando Google Trends..."):
-        try:
-            # Obtener opciones del sidebar
-            search_category = st.session_state.get("search_category", 5)  # Default: Informática
-            exact_match = st.session_state.get("exact_match", True)
-
-            trends_data = trends_module.get_interest_over_time(
+    # Obtener datos (todas las consultas SerpAPI en paralelo)
+    search_category = st.session_state.get("search_category", 5)  # Default: Informática
+    exact_match = st.session_state.get("exact_match", True)
+
+    geo = st.session_state.selected_country
+    timeframe = st.session_state.selected_timeframe
+
+    # Los resultados se guardan por parámetros de búsqueda: los reruns por
+    # widgets que no cambian la búsqueda no vuelven a llamar a ninguna API
+    analysis_key = (keyword, geo, timeframe, search_category, exact_match)
+    analysis_cache = st.session_state.analysis_cache
+
+    # "Refrescar datos": nuevo nonce para esta búsqueda (la caché compartida
+    # de las demás búsquedas y usuarios no se toca)
+    refresh_nonces = st.session_state.refresh_nonces
+    if refresh_clicked:
+        analysis_cache.pop(analysis_key, None)
+        refresh_nonces[analysis_key] = time.time_ns()
+    refresh_nonce = refresh_nonces.get(analysis_key, 0)
+
+    bundle = analysis_cache.get(analysis_key)
+
+    if bundle is None:
+        with st.spinner("🔮 Consultando Google Trends, búsquedas relacionadas, preguntas, noticias y productos..."):
+            results = fetch_deep_dive_data(
+                mods=mods,
+                api_key_hash=api_key_hash,
                 keyword=keyword,
-                geo=st.session_state.selected_country,
-                timeframe=st.session_state.selected_timeframe,
+                geo=geo,
+                timeframe=timeframe,
                 category=search_category,
-                exact_match=exact_match
+                exact_match=exact_match,
+                ai_provider=st.session_state.ai_provider if ai_providers else None,
+                refresh_nonce=refresh_nonce
             )
 
-            # Mostrar info de búsqueda si usó comillas
-            if trends_data.get("exact_match"):
-                st.caption(f"🔍 Búsqueda: `{trends_data.get('query_used', keyword)}` | Categoría: {search_category}")
+        trends_data = results["trends"]
+        if isinstance(trends_data, Exception):
+            st.error(f"Error consultando Google Trends: {sanitize_html(str(trends_data))}")
+            return
 
-        except Exception as e:
-            st.error(f"Error consultando Google Trends: {sanitize_html(str(e))}")
+        if not trends_data.get("success"):
+            error_msg = trends_data.get('error', 'Error desconocido')
+            st.error(f"Error obteniendo datos: {sanitize_html(str(error_msg))}")
+            st.info("💡 Esto puede ocurrir si la marca es muy nueva o tiene poco volumen de búsqueda.")
             return
 
-    if not trends_data.get("success"):
-        error_msg = trends_data.get('error', 'Error desconocido')
-        st.error(f"Error obteniendo datos: {sanitize_html(str(error_msg))}")
-        st.info("💡 Esto puede ocurrir si la marca es muy nueva o tiene poco volumen de búsqueda.")
-        return
+        timeline_data = trends_data.get("timeline_data", [])
 
-    timeline_data = trends_data.get("timeline_data", [])
+        if not timeline_data:
+            st.warning(f"No se encontraron datos para '{keyword_display}'.")
+            st.info("💡 Prueba con otro término o verifica que la marca existe.")
+            return
 
-    if not timeline_data:
-        st.warning(f"No se encontraron datos para '{keyword_display}'.")
-        st.info("💡 Prueba con otro término o verifica que la marca existe.")
-        return
+        # Calcular métricas (manejando valores cero)
+        # Los valores se extraen una vez y se reutilizan en crecimiento y scores
+        timeline_values = extract_timeline_values(timeline_data)
+        growth_data = calculate_growth_rate(timeline_data, values=timeline_values)
+        seasonality_data = calculate_seasonality(timeline_data)
 
-    # Calcular métricas (manejando valores cero)
-    growth_data = calculate_growth_rate(timeline_data)
-    seasonality_data = calculate_seasonality(timeline_data)
+        # Búsquedas relacionadas
+        related_data = results["related"]
+        if isinstance(related_data, Exception):
+            related_data = {"success": False, "queries": {"rising": [], "top": []}, "topics": {"rising": [], "top": []}}
+        elif related_data.get("success"):
+            # Enriquecer con breakout_score para comparación
+            queries = related_data.get("queries", {})
+            if queries.get("rising"):
+                queries["rising"] = mods.related.enrich_with_breakout_scores(
+                    queries["rising"], is_topic=False
+                )
+
+            topics = related_data.get("topics", {})
+            if topics.get("rising"):
+                topics["rising"] = mods.related.enrich_with_breakout_scores(
+                    topics["rising"], is_topic=True
+                )
+
+        # PAA expandido
+        paa_data = results["paa"]
+        if isinstance(paa_data, Exception):
+            paa_data = {"success": False, "categorized": {"all": [], "questions": [], "comparatives": [], "others": []}}
 
-    # Obtener datos relacionados
-    with st.spinner("🔍 Obteniendo búsquedas relacionadas..."):
+        expanded_questions = results["questions"]
+        questions = [] if isinstance(expanded_questions, Exception) else expanded_questions.get("questions", [])
+
+        # Productos de la marca
+        product_analysis = results["products"]
+        if isinstance(product_analysis, Exception):
+            product_analysis = {"success": False, "products": [], "classified": {}, "insights": {}}
+
+        # Noticias
+        news_data = results["news"]
+        if isinstance(news_data, Exception):
+            news_data = {"success": False, "news": []}
+
+        # Sentimiento de noticias: se calcula una vez por búsqueda y se guarda
+        # en el análisis, así los reruns no lo repiten
+        news_sentiment = None
+        if news_data.get("success") and news_data.get("news"):
+            try:
+                news_sentiment = mods.news.analyze_news_sentiment(news_data["news"])
+            except Exception:
+                news_sentiment = None
+
+        # Explicación IA de estacionalidad (si falló, se reintenta al renderizar)
+        ai_explanation = results.get("seasonality_explanation")
+        if isinstance(ai_explanation, Exception):
+            ai_explanation = None
+
+        # Calcular scores (manejando valores cero)
         try:
-            related_data = related_module.get_all_related(
-                keyword=keyword,
-                geo=st.session_state.selected_country,
-                timeframe=st.session_state.selected_timeframe
+            trend_score = mods.scoring.calculate_trend_score(
+                timeline_data=timeline_data,
+                related_queries_count=len(related_data.get("queries", {}).get("rising", [])),
+                values=timeline_values
             )
-            
-            # Enriquecer con breakout_score para comparación
-            if related_data.get("success"):
-                # Enriquecer queries
-                queries = related_data.get("queries", {})
-                if queries.get("rising"):
-                    queries["rising"] = related_module.enrich_with_breakout_scores(
-                        queries["rising"], is_topic=False
-                    )
-                
-                # Enriquecer topics
-                topics = related_data.get("topics", {})
-                if topics.get("rising"):
-                    topics["rising"] = related_module.enrich_with_breakout_scores(
-                        topics["rising"], is_topic=True
-                    )
-                    
-        except Exception as e:
-            related_data = {"success": False, "queries": {"rising": [], "top": []}, "topics": {"rising": [], "top": []}}
+        except Exception:
+            trend_score = {"score": 0, "grade": "F", "factors": {}}
 
-    # Obtener PAA expandido
-    with st.spinner("❓ Buscando preguntas frecuentes..."):
         try:
-            paa_data = paa_module.categorize_searches(
-                keyword=keyword,
-                country=st.session_state.selected_country
+            potential_score = mods.scoring.calculate_potential_score(
+                timeline_data=timeline_data,
+                rising_queries=related_data.get("queries", {}).get("rising", []),
+                current_value=growth_data.get("current_value", 0),
+                is_seasonal=seasonality_data.get("is_seasonal", False),
+                values=timeline_values
             )
-        except Exception as e:
-            paa_data = {"success": False, "categorized": {"all": [], "questions": [], "comparatives": [], "others": []}}
+        except Exception:
+            potential_score = {"score": 0, "grade": "F", "factors": {}}
 
         try:
-            expanded_questions = paa_module.get_expanded_questions(
-                keyword=keyword,
-                country=st.session_state.selected_country,
-                max_depth=2,
-                max_questions=25
+            opportunity = mods.scoring.calculate_opportunity_level(
+                trend_score=trend_score.get("score", 0),
+                potential_score=potential_score.get("score", 0)
             )
-            questions = expanded_questions.get("questions", [])
-        except Exception as e:
-            questions = []
-
-    # Calcular scores (manejando valores cero)
-    try:
-        trend_score = scoring_engine.calculate_trend_score(
-            timeline_data=timeline_data,
-            related_queries_count=len(related_data.get("queries", {}).get("rising", []))
-        )
-    except Exception:
-        trend_score = {"score": 0, "grade": "F", "factors": {}}
-
-    try:
-        potential_score = scoring_engine.calculate_potential_score(
-            timeline_data=timeline_data,
-            rising_queries=related_data.get("queries", {}).get("rising", []),
-            current_value=growth_data.get("current_value", 0),
-            is_seasonal=seasonality_data.get("is_seasonal", False)
-        )
-    except Exception:
-        potential_score = {"score": 0, "grade": "F", "factors": {}}
-
-    try:
-        opportunity = scoring_engine.calculate_opportunity_level(
-            trend_score=trend_score.get("score", 0),
-            potential_score=potential_score.get("score", 0)
-        )
-    except Exception:
-        opportunity = {"level": "MUY BAJA", "combined_score": 0, "color": "#EF4444", "icon": "❄️", "action": "No prioritario"}
+        except Exception:
+            opportunity = {"level": "MUY BAJA", "combined_score": 0, "color": "#EF4444", "icon": "❄️", "action": "No prioritario"}
+
+        bundle = {
+            "trends_data": trends_data,
+            "growth_data": growth_data,
+            "seasonality_data": seasonality_data,
+            "related_data": related_data,
+            "paa_data": paa_data,
+            "questions": questions,
+            "product_analysis": product_analysis,
+            "news_data": news_data,
+            "news_sentiment": news_sentiment,
+            "trend_score": trend_score,
+            "potential_score": potential_score,
+            "opportunity": opportunity,
+            "ai_provider": st.session_state.ai_provider,
+            "ai_explanation": ai_explanation,
+            "ai_result": None
+        }
+        store_analysis(analysis_cache, analysis_key, bundle)
+
+    trends_data = bundle["trends_data"]
+    timeline_data = trends_data.get("timeline_data", [])
+    growth_data = bundle["growth_data"]
+    seasonality_data = bundle["seasonality_data"]
+    related_data = bundle["related_data"]
+    paa_data = bundle["paa_data"]
+    questions = bundle["questions"]
+    product_analysis = bundle["product_analysis"]
+    news_data = bundle["news_data"]
+    trend_score = bundle["trend_score"]
+    potential_score = bundle["potential_score"]
+    opportunity = bundle["opportunity"]
+
+    # El análisis IA depende del proveedor: si cambia, se regenera
+    if bundle["ai_provider"] != st.session_state.ai_provider:
+        bundle["ai_provider"] = st.session_state.ai_provider
+        bundle["ai_explanation"] = None
+        bundle["ai_result"] = None
+
+    # Mostrar info de búsqueda si usó comillas
+    if trends_data.get("exact_match"):
+        st.caption(f"🔍 Búsqueda: `{trends_data.get('query_used', keyword)}` | Categoría: {search_category}")
 
     # === LAYOUT PRINCIPAL ===
 
@@ -498,7 +918,7 @@ def main():
         timeline_data=timeline_data,
         keyword=keyword,
         show_trajectory=st.session_state.get("show_trajectory", True),
-        api_key=st.secrets.get("SERPAPI_KEY", ""),
+        api_key=serpapi_key,
         geo=st.session_state.selected_country,
         show_volume_estimate=st.session_state.get("show_volume_estimate", True)
     )
@@ -528,15 +948,16 @@ def main():
 
     with col_season:
         # Explicación IA de estacionalidad
-        ai_explanation = None
-        if ai_analyzer.get_available_providers():
+        ai_explanation = bundle["ai_explanation"]
+        if ai_explanation is None and ai_providers:
             try:
                 with st.spinner("🤖 Generando explicación..."):
-                    ai_explanation = ai_analyzer.explain_seasonality(
+                    ai_explanation = mods.ai.explain_seasonality(
                         seasonality_data=seasonality_data,
                         brand=keyword,
                         provider=st.session_state.ai_provider
                     )
+                bundle["ai_explanation"] = ai_explanation
             except Exception:
                 ai_explanation = None
 
@@ -562,23 +983,6 @@ def main():
     st.markdown("---")
 
     # Fila 4: Análisis de Productos de la Marca
-    with st.spinner("🏷️ Analizando productos de la marca..."):
-        try:
-            # Combinar queries rising y top para detección
-            all_related_queries = (
-                related_data.get("queries", {}).get("rising", []) +
-                related_data.get("queries", {}).get("top", [])
-            )
-
-            product_analysis = product_analyzer.full_analysis(
-                brand=keyword,
-                related_queries=all_related_queries,
-                geo=st.session_state.selected_country,
-                timeframe=st.session_state.selected_timeframe
-            )
-        except Exception as e:
-            product_analysis = {"success": False, "products": [], "classified": {}, "insights": {}}
-
     render_product_section(product_analysis, keyword)
 
     st.markdown("---")
@@ -608,29 +1012,43 @@ def main():
             2. Habilitar "YouTube Data API v3"
             3. Crear credenciales > API Key
             """)
-        else:
-            with st.spinner("🔍 Analizando YouTube (Deep Dive)..."):
-                try:
-                    yt_module = get_youtube_module()
-                    if yt_module:
-                        # Deep Dive Analysis (incluye sentimiento, marcas, idiomas)
-                        youtube_deep_dive = yt_module.deep_dive_analysis(
-                            brand=keyword,
-                            geo=st.session_state.selected_country,
-                            max_videos=50
-                        )
-                        
-                        # También obtener métricas básicas para compatibilidad
-                        if youtube_deep_dive and youtube_deep_dive.videos_by_type:
-                            youtube_data = youtube_deep_dive.videos_by_type
-                            youtube_metrics = yt_module.calculate_metrics(keyword, youtube_data)
 
-                        # Mostrar error de API si lo hubo
-                        if youtube_metrics and youtube_metrics.api_error:
-                            st.warning(f"⚠️ API: {youtube_metrics.api_error}")
+        # Las consultas gastan cuota: solo se lanzan si el usuario lo pide,
+        # y el resultado se guarda con el resto del análisis
+        load_youtube = yt_config.get("configured") and st.checkbox(
+            "Cargar análisis de YouTube",
+            key="load_youtube",
+            help="Consulta la YouTube Data API (consume cuota)"
+        )
+
+        if load_youtube:
+            if "youtube" not in bundle:
+                with st.spinner("🔍 Analizando YouTube (Deep Dive)..."):
+                    try:
+                        yt_module = get_youtube_module()
+                        if yt_module:
+                            # Deep Dive Analysis (incluye sentimiento, marcas, idiomas)
+                            youtube_deep_dive = yt_module.deep_dive_analysis(
+                                brand=keyword,
+                                geo=st.session_state.selected_country,
+                                max_videos=50
+                            )
 
-                except Exception as e:
-                    st.warning(f"Error consultando YouTube: {sanitize_html(str(e))}")
+                            # También obtener métricas básicas para compatibilidad
+                            if youtube_deep_dive and youtube_deep_dive.videos_by_type:
+                                youtube_data = youtube_deep_dive.videos_by_type
+                                youtube_metrics = yt_module.calculate_metrics(keyword, youtube_data)
+
+                        bundle["youtube"] = (youtube_deep_dive, youtube_data, youtube_metrics)
+
+                    except Exception as e:
+                        st.warning(f"Error consultando YouTube: {sanitize_html(str(e))}")
+
+            youtube_deep_dive, youtube_data, youtube_metrics = bundle.get("youtube", (None, None, None))
+
+            # Mostrar error de API si lo hubo
+            if youtube_metrics and youtube_metrics.api_error:
+                st.warning(f"⚠️ API: {youtube_metrics.api_error}")
 
         # Renderizar Deep Dive si hay datos
         if youtube_deep_dive and youtube_deep_dive.total_videos_analyzed > 0:
@@ -661,7 +1079,7 @@ def main():
             )
 
             # Solo mostrar score si hay YouTube configurado pero sin datos aún
-            if not youtube_deep_dive and not youtube_data and yt_config.get("configured"):
+            if not youtube_deep_dive and not youtube_data and load_youtube:
                 render_social_media_section(
                     keyword=keyword,
                     youtube_data=youtube_data,
@@ -678,8 +1096,9 @@ def main():
     st.markdown("---")
 
     # Fila 4.6: Market Intelligence (Perplexity)
-    market_analysis = None
-    product_intelligence = None
+    # Se lee del análisis guardado: el PDF lo incluye aunque el checkbox no
+    # esté marcado en este rerun
+    market_analysis, product_intelligence = bundle.get("market_intelligence", (None, None))
 
     with st.expander("🧠 Inteligencia de Mercado (Perplexity)", expanded=False):
         pplx_config = check_perplexity_config()
@@ -701,34 +1120,42 @@ def main():
             - ⚔️ Análisis competitivo actualizado
             - 💡 Oportunidades y amenazas
             """)
-        else:
-            with st.spinner("Analizando mercado con Perplexity..."):
-                try:
-                    mi_module = get_market_intelligence()
-                    if mi_module:
-                        # Análisis completo del producto/marca
-                        product_intelligence = mi_module.analyze_product_complete(
-                            product_name=keyword,
-                            brand="",
-                            include_competitors=True
-                        )
-
-                        # Análisis de mercado
-                        market_analysis = mi_module.analyze_market(
-                            brand=keyword,
-                            category="tecnología",
-                            geo="España" if st.session_state.selected_country == "ES" else st.session_state.selected_country
-                        )
-
-                        # Renderizar panel completo
-                        render_market_intelligence_panel(
-                            keyword=keyword,
-                            market_analysis=market_analysis,
-                            product_intelligence=product_intelligence
-                        )
+        elif st.checkbox(
+            "Cargar análisis de mercado",
+            key="load_market_intelligence",
+            help="Consulta la API de Perplexity"
+        ):
+            try:
+                if "market_intelligence" not in bundle:
+                    with st.spinner("Analizando mercado con Perplexity..."):
+                        mi_module = get_market_intelligence()
+                        if mi_module:
+                            # Análisis completo del producto/marca
+                            product_intelligence = mi_module.analyze_product_complete(
+                                product_name=keyword,
+                                brand="",
+                                include_competitors=True
+                            )
+
+                            # Análisis de mercado
+                            market_analysis = mi_module.analyze_market(
+                                brand=keyword,
+                                category="tecnología",
+                                geo="España" if st.session_state.selected_country == "ES" else st.session_state.selected_country
+                            )
+
+                            bundle["market_intelligence"] = (market_analysis, product_intelligence)
+
+                if "market_intelligence" in bundle:
+                    # Renderizar panel completo
+                    render_market_intelligence_panel(
+                        keyword=keyword,
+                        market_analysis=market_analysis,
+                        product_intelligence=product_intelligence
+                    )
 
-                except Exception as e:
-                    st.warning(f"Error en análisis de mercado: {sanitize_html(str(e))}")
+            except Exception as e:
+                st.warning(f"Error en análisis de mercado: {sanitize_html(str(e))}")
 
     st.markdown("---")
 
@@ -736,16 +1163,23 @@ def main():
     ali_config = check_aliexpress_config()
     if ali_config["has_key"] and ali_config["has_secret"]:
         with st.expander("🛒 Datos de AliExpress", expanded=False):
-            with st.spinner("Consultando AliExpress..."):
+            if st.checkbox("Cargar datos de AliExpress", key="load_aliexpress"):
                 try:
-                    ali_module = get_aliexpress_module()
-                    if ali_module:
-                        # Buscar productos
-                        ali_products = ali_module.search_products(keyword, max_results=50)
-                        ali_hotproducts = ali_module.get_hotproducts(keyword, max_results=20)
+                    if "aliexpress" not in bundle:
+                        with st.spinner("Consultando AliExpress..."):
+                            ali_module = get_aliexpress_module()
+                            if ali_module:
+                                # Buscar productos
+                                ali_products = ali_module.search_products(keyword, max_results=50)
+                                ali_hotproducts = ali_module.get_hotproducts(keyword, max_results=20)
 
-                        # Calcular métricas
-                        ali_metrics = ali_module.calculate_metrics(keyword, ali_products)
+                                # Calcular métricas
+                                ali_metrics = ali_module.calculate_metrics(keyword, ali_products)
+
+                                bundle["aliexpress"] = (ali_products, ali_hotproducts, ali_metrics)
+
+                    if "aliexpress" in bundle:
+                        ali_products, ali_hotproducts, ali_metrics = bundle["aliexpress"]
 
                         # Renderizar panel
                         render_aliexpress_panel(keyword, ali_products, ali_hotproducts, ali_metrics)
@@ -783,71 +1217,69 @@ def main():
     st.markdown("---")
 
     # Fila 6: Análisis IA
-    if ai_analyzer.get_available_providers():
+    if ai_providers:
         st.markdown("### 🤖 Análisis IA")
 
         try:
-            with st.spinner(f"Generando análisis con {st.session_state.ai_provider}..."):
-                # Preparar datos para el análisis
-                analysis_data = {
-                    "keyword": keyword,
-                    "current_value": growth_data.get("current_value", 0),
-                    "growth_rate": growth_data.get("growth_rate", 0),
-                    "trend_score": trend_score.get("score", 0),
-                    "potential_score": potential_score.get("score", 0),
-                    "is_seasonal": seasonality_data.get("is_seasonal", False),
-                    "rising_queries": related_data.get("queries", {}).get("rising", [])[:5],
-                    "questions": [q.get("question", "") for q in questions[:5] if isinstance(q, dict)]
-                }
-
-                ai_result = ai_analyzer.analyze(
-                    trend_data=analysis_data,
-                    provider=st.session_state.ai_provider
-                )
-
-            if ai_result.get("success"):
-                # Análisis principal - sanitizar contenido de IA
-                analysis_text = sanitize_html(ai_result.get("analysis", "No se pudo generar el análisis"))
-                provider_name = sanitize_html(ai_result.get("provider", "IA"))
-
+            # Preparar datos para el análisis
+            analysis_data = {
+                "keyword": keyword,
+                "current_value": growth_data.get("current_value", 0),
+                "growth_rate": growth_data.get("growth_rate", 0),
+                "trend_score": trend_score.get("score", 0),
+                "potential_score": potential_score.get("score", 0),
+                "is_seasonal": seasonality_data.get("is_seasonal", False),
+                "rising_queries": related_data.get("queries", {}).get("rising", [])[:5],
+                "questions": [q.get("question", "") for q in questions[:5] if isinstance(q, dict)]
+            }
+
+            ai_result = bundle["ai_result"]
+
+            if ai_result is not None:
+                # Análisis ya generado en un rerun anterior
                 st.markdown(
-                    f'''
-                    <div style="background: linear-gradient(135deg, #EDE9FE 0%, #FFFFFF 100%);
-                    border-radius: 12px; padding: 24px; border-left: 4px solid #7C3AED;
-                    margin-bottom: 16px;">
-                        <div style="display: flex; align-items: center; gap: 8px; margin-bottom: 12px;">
-                            <span style="font-size: 1.25rem;">🧠</span>
-                            <span style="font-weight: 600; color: #5B21B6;">
-                                Análisis ({provider_name})
-                            </span>
-                        </div>
-                        <div style="color: #374151; line-height: 1.6;">
-                            {analysis_text}
-                        </div>
-                    </div>
-                    ''',
+                    ai_analysis_card(ai_result["provider_name"], ai_result["analysis_html"]),
                     unsafe_allow_html=True
                 )
-
-                # Ideas de blog
-                blog_ideas = ai_result.get("blog_ideas", [])
-                if blog_ideas:
-                    st.markdown("#### 📝 Ideas para el blog")
-
-                    for i, idea in enumerate(blog_ideas[:5]):
-                        if not isinstance(idea, dict):
-                            continue
-                        titulo = sanitize_html(idea.get('titulo', f'Idea {i+1}'))
-                        with st.expander(f"💡 {titulo}"):
-                            enfoque = sanitize_html(idea.get('enfoque', 'N/A'))
-                            st.markdown(f"**Enfoque:** {enfoque}")
-                            keywords = idea.get('keywords_objetivo', [])
-                            if keywords and isinstance(keywords, list):
-                                keywords_safe = [sanitize_html(str(k)) for k in keywords[:10]]
-                                st.markdown(f"**Keywords:** {', '.join(keywords_safe)}")
             else:
-                error_msg = sanitize_html(ai_result.get('error', 'Error desconocido'))
-                st.warning(f"No se pudo generar el análisis: {error_msg}")
+                # Análisis principal en streaming - sanitizar contenido de IA
+                provider_name = sanitize_html(mods.ai.get_provider_name(st.session_state.ai_provider))
+                analysis_placeholder = st.empty()
+                analysis_text = ""
+
+                with st.spinner(f"Generando análisis con {st.session_state.ai_provider}..."):
+                    for chunk in mods.ai.analyze_stream(
+                        trend_data=analysis_data,
+                        provider=st.session_state.ai_provider
+                    ):
+                        analysis_text += sanitize_html(chunk)
+                        analysis_placeholder.markdown(
+                            ai_analysis_card(provider_name, analysis_text),
+                            unsafe_allow_html=True
+                        )
+
+                if not analysis_text:
+                    analysis_text = "No se pudo generar el análisis"
+                    analysis_placeholder.markdown(
+                        ai_analysis_card(provider_name, analysis_text),
+                        unsafe_allow_html=True
+                    )
+
+                # Ideas de blog (se piden cuando termina el análisis)
+                with st.spinner("Generando ideas para el blog..."):
+                    blog_result = mods.ai.generate_blog_ideas(
+                        trend_data=analysis_data,
+                        provider=st.session_state.ai_provider
+                    )
+
+                ai_result = {
+                    "provider_name": provider_name,
+                    "analysis_html": analysis_text,
+                    "blog_ideas": blog_result.get("ideas", [])
+                }
+                bundle["ai_result"] = ai_result
+
+            render_blog_ideas(ai_result["blog_ideas"])
         except Exception as e:
             st.warning(f"Error en análisis IA: {sanitize_html(str(e))}")
 
@@ -857,22 +1289,14 @@ def main():
     st.markdown("### 📰 Noticias Relacionadas")
 
     try:
-        with st.spinner("Buscando noticias..."):
-            news_data = news_module.search_news(
-                query=keyword,
-                country=st.session_state.selected_country
-            )
-
         if news_data.get("success") and news_data.get("news"):
-            # Analizar sentimiento
-            sentiment = news_module.analyze_news_sentiment(news_data.get("news", []))
-
+            # Sentimiento ya calculado al construir el análisis
             render_news_panel(
                 news=news_data.get("news", []),
                 title=f"📰 Noticias sobre {keyword_display}",
                 max_display=6,
                 show_sentiment=True,
-                sentiment_data=sentiment
+                sentiment_data=bundle.get("news_sentiment")
             )
         else:
             st.info(f"No se encontraron noticias recientes sobre '{keyword_display}'")
@@ -889,11 +1313,17 @@ def main():
     if compare_countries:
         try:
             with st.spinner("Obteniendo datos por país..."):
-                country_data = trends_module.get_multi_country_data(
-                    keyword=keyword,
-                    countries=["ES", "PT", "FR", "IT", "DE"],
-                    timeframe=st.session_state.selected_timeframe
-                )
+                try:
+                    country_data = fetch_multi_country(
+                        mods.trends,
+                        api_key_hash,
+                        keyword=keyword,
+                        countries=("ES", "PT", "FR", "IT", "DE"),
+                        timeframe=st.session_state.selected_timeframe,
+                        refresh_nonce=refresh_nonce
+                    )
+                except _FetchFailed as e:
+                    country_data = e.result
 
             render_geo_comparison(
                 country_data=country_data.get("countries", {}),
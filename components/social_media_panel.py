@@ -4,16 +4,58 @@ Panel unificado para YouTube + TikTok + Social Score
 """
 
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import html as html_module
-from typing import Optional, Dict, Any
-import pandas as pd
+from typing import Optional, Dict, Any, Tuple, NamedTuple
 
 # Usar helpers compartidos
 from utils.helpers import format_number, safe_get, sanitize_html
 
 
+# Tabla de escape HTML (equivale a html.escape con quote=True, en una pasada)
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;"
+})
+
+# Tipo de alerta según la oportunidad detectada (por defecto st.info)
+_OPPORTUNITY_RENDERERS = {
+    "early_opportunity": st.success,
+    "content_gap": st.warning,
+    "low_traction": st.warning
+}
+
+# Color por tipo de señal en la comparativa de scores
+_COMPARISON_COLORS = {
+    "Búsquedas": "#7C3AED",
+    "Contenido": "#EF4444",
+    "Viralidad": "#10B981",
+    "Combinado": "#F59E0B"
+}
+
+# Cuadrantes de la matriz de oportunidad: ((x0, y0, x1, y1), relleno)
+_QUADRANT_RECTS = (
+    ((0, 50, 50, 100), "rgba(16, 185, 129, 0.2)"),
+    ((50, 50, 100, 100), "rgba(245, 158, 11, 0.2)"),
+    ((0, 0, 50, 50), "rgba(239, 68, 68, 0.2)"),
+    ((50, 0, 100, 50), "rgba(59, 130, 246, 0.2)")
+)
+
+# Etiquetas centradas en cada cuadrante: (x, y, texto)
+_QUADRANT_LABELS = (
+    (25, 75, "🚀 OPORTUNIDAD"),
+    (75, 75, "📈 ESTABLECIDO"),
+    (25, 25, "📉 BAJA TRACCIÓN"),
+    (75, 25, "📝 GAP CONTENIDO")
+)
+
+
+def _esc(text: str) -> str:
+    """Escapa texto para HTML con la tabla precalculada"""
+    return text.translate(_HTML_ESCAPE_TABLE)
+
+
 def render_social_media_section(
     keyword: str,
     youtube_data: Optional[Dict] = None,
@@ -37,19 +79,9 @@ def render_social_media_section(
     """
     st.markdown("### 📱 Social Media Intelligence")
 
-    # Verificar datos de forma segura
-    has_youtube = False
-    has_tiktok = False
-
-    try:
-        has_youtube = youtube_metrics is not None and getattr(youtube_metrics, 'total_videos', 0) > 0
-    except Exception:
-        pass
-
-    try:
-        has_tiktok = tiktok_metrics is not None and getattr(tiktok_metrics, 'total_videos', 0) > 0
-    except Exception:
-        pass
+    # Verificar datos de forma segura (getattr con default no lanza excepción)
+    has_youtube = youtube_metrics is not None and getattr(youtube_metrics, 'total_videos', 0) > 0
+    has_tiktok = tiktok_metrics is not None and getattr(tiktok_metrics, 'total_videos', 0) > 0
 
     if not has_youtube and not has_tiktok:
         st.info("No se encontraron datos de redes sociales para este término.")
@@ -65,8 +97,23 @@ def render_social_media_section(
         _render_opportunity_alert(social_metrics)
         st.markdown("---")
 
+    # Una sola plataforma y sin Social Score: contenido en línea, sin tabs
+    if has_youtube + has_tiktok == 1 and social_metrics is None:
+        if has_youtube:
+            _render_youtube_tab(youtube_data, youtube_metrics)
+        else:
+            _render_tiktok_tab(tiktok_data, tiktok_metrics)
+
+        st.markdown("---")
+        _render_comparison_tab(
+            trends_score=trends_score,
+            youtube_metrics=youtube_metrics,
+            tiktok_metrics=tiktok_metrics,
+            social_metrics=social_metrics
+        )
+        return
+
     # Tabs por plataforma
-    tabs = []
     tab_names = []
 
     if has_youtube:
@@ -131,55 +178,78 @@ def render_social_media_mini(
             st.info(f"📊 Social Score: {score}/100")
 
 
+def _compute_summary_payload(
+    youtube: Optional[Tuple[int, int, int]],
+    tiktok: Optional[Tuple[int, int]],
+    social_score: Optional[int]
+) -> Dict[str, Any]:
+    """
+    Textos del resumen de métricas sociales (solo datos, sin widgets)
+
+    Args:
+        youtube: (total_videos, recent_videos_30d, total_views) o None
+        tiktok: (hashtag_views, total_videos) o None
+        social_score: Social Score o None
+
+    Returns:
+        Dict con los valores ya formateados para cada métrica
+    """
+    payload = {
+        "yt_videos": "N/A",
+        "yt_delta": None,
+        "yt_views": "N/A",
+        "tt_views": "No config.",
+        "tt_videos": "N/A",
+        "social_score": social_score
+    }
+
+    if youtube:
+        total_videos, recent_videos, total_views = youtube
+        payload["yt_videos"] = f"{total_videos}"
+        payload["yt_delta"] = f"+{recent_videos} (30d)" if recent_videos > 0 else None
+        payload["yt_views"] = format_number(total_views)
+
+    if tiktok:
+        hashtag_views, total_videos = tiktok
+        payload["tt_views"] = format_number(hashtag_views)
+        payload["tt_videos"] = f"{total_videos}"
+
+    return payload
+
+
 def _render_social_summary(
     youtube_metrics: Optional[Any],
     tiktok_metrics: Optional[Any],
     social_metrics: Optional[Any]
 ) -> None:
     """Renderiza resumen de métricas sociales"""
+    if youtube_metrics is None and tiktok_metrics is None and social_metrics is None:
+        st.info("Sin datos sociales")
+        return
 
-    cols = st.columns(5)
-
-    with cols[0]:
-        if youtube_metrics:
-            st.metric(
-                "📺 Videos YouTube",
-                f"{youtube_metrics.total_videos}",
-                delta=f"+{youtube_metrics.recent_videos_30d} (30d)" if youtube_metrics.recent_videos_30d > 0 else None
-            )
-        else:
-            st.metric("📺 Videos YouTube", "N/A")
-
-    with cols[1]:
-        if youtube_metrics:
-            st.metric(
-                "👁️ Vistas YouTube",
-                format_number(youtube_metrics.total_views)
-            )
-        else:
-            st.metric("👁️ Vistas YouTube", "N/A")
-
-    with cols[2]:
-        if tiktok_metrics:
-            st.metric(
-                "🎵 Views TikTok",
-                format_number(tiktok_metrics.hashtag_views)
-            )
-        else:
-            st.metric("🎵 Views TikTok", "No config.")
-
-    with cols[3]:
-        if tiktok_metrics:
-            st.metric(
-                "📹 Videos TikTok",
-                f"{tiktok_metrics.total_videos}"
-            )
-        else:
-            st.metric("📹 Videos TikTok", "N/A")
-
-    with cols[4]:
-        if social_metrics:
-            score = social_metrics.social_score
+    payload = _compute_summary_payload(
+        (youtube_metrics.total_videos, youtube_metrics.recent_videos_30d, youtube_metrics.total_views)
+        if youtube_metrics else None,
+        (tiktok_metrics.hashtag_views, tiktok_metrics.total_videos) if tiktok_metrics else None,
+        social_metrics.social_score if social_metrics else None
+    )
+
+    specs = [
+        ("📺 Videos YouTube", payload["yt_videos"], payload["yt_delta"]),
+        ("👁️ Vistas YouTube", payload["yt_views"], None),
+        ("🎵 Views TikTok", payload["tt_views"], None),
+        ("📹 Videos TikTok", payload["tt_videos"], None)
+    ]
+
+    # La columna del Social Score solo se crea si hay score
+    score = payload["social_score"]
+    cols = st.columns(5 if score is not None else 4)
+
+    for col, (label, value, delta) in zip(cols, specs):
+        col.metric(label, value, delta=delta)
+
+    if score is not None:
+        with cols[4]:
             if score >= 70:
                 st.success(f"🎯 **{score}**/100")
             elif score >= 40:
@@ -187,28 +257,13 @@ def _render_social_summary(
             else:
                 st.info(f"📊 **{score}**/100")
             st.caption("Social Score")
-        else:
-            st.metric("Social Score", "N/A")
 
 
 def _render_opportunity_alert(social_metrics: Any) -> None:
     """Renderiza alerta de oportunidad detectada"""
 
-    opp_type = social_metrics.opportunity_type
-    description = social_metrics.opportunity_description
-
-    if opp_type == "early_opportunity":
-        st.success(description)
-    elif opp_type == "content_gap":
-        st.warning(description)
-    elif opp_type == "established":
-        st.info(description)
-    elif opp_type == "emerging":
-        st.info(description)
-    elif opp_type == "low_traction":
-        st.warning(description)
-    else:
-        st.info(description)
+    render = _OPPORTUNITY_RENDERERS.get(social_metrics.opportunity_type, st.info)
+    render(social_metrics.opportunity_description)
 
 
 def _render_youtube_tab(
@@ -250,42 +305,79 @@ def _render_youtube_tab(
         _render_video_list(youtube_data.get("general", []), "general")
 
     # Top canales
-    if youtube_metrics and youtube_metrics.top_channels:
+    top_channels = youtube_metrics.top_channels[:5] if youtube_metrics else []
+    if top_channels:
         st.markdown("#### 🎬 Top Canales")
-        for i, channel in enumerate(youtube_metrics.top_channels[:5], 1):
-            st.markdown(f"{i}. **{html_module.escape(channel)}**")
+        st.markdown("\n".join(
+            f"{i}. **{_esc(channel)}**" for i, channel in enumerate(top_channels, 1)
+        ))
 
 
-def _render_video_list(videos: list, key_prefix: str) -> None:
-    """Renderiza lista de videos"""
-    if not videos:
-        st.info("No se encontraron videos de este tipo")
-        return
+class _PreparedVideo(NamedTuple):
+    """Campos de un video listos para renderizar (ya escapados)"""
+    title: str
+    link: str
+    thumbnail: str
+    views: str
+    channel: str
+    published: str
 
-    for i, video in enumerate(videos[:8]):
-        with st.container():
-            col1, col2 = st.columns([1, 3])
 
-            with col1:
-                if hasattr(video, 'thumbnail') and video.thumbnail:
-                    st.image(video.thumbnail, width="stretch")
+def _safe_url(url: Optional[str]) -> str:
+    """URL escapada para atributos HTML; descarta esquemas que no sean http(s)"""
+    if not url or not url.startswith(("http://", "https://")):
+        return ""
+    return _esc(url)
 
-            with col2:
-                title = html_module.escape(video.title[:60] + "..." if len(video.title) > 60 else video.title)
-                if hasattr(video, 'link') and video.link:
-                    st.markdown(f"**[{title}]({video.link})**")
-                else:
-                    st.markdown(f"**{title}**")
 
-                views_str = video.views_formatted if hasattr(video, 'views_formatted') else str(video.views)
-                channel = html_module.escape(video.channel[:30]) if hasattr(video, 'channel') and video.channel else ""
+def _prepare_video(video: Any) -> _PreparedVideo:
+    """Extrae y escapa una vez los campos que muestra la lista de videos"""
+    title = video.title[:60] + "..." if len(video.title) > 60 else video.title
+    views = getattr(video, 'views_formatted', None)
+    channel = getattr(video, 'channel', None)
+    published = getattr(video, 'published', None)
 
-                st.caption(f"👁️ {views_str} · 📺 {channel}")
+    return _PreparedVideo(
+        title=_esc(title),
+        link=_safe_url(getattr(video, 'link', None)),
+        thumbnail=_safe_url(getattr(video, 'thumbnail', None)),
+        views=_esc(views if views is not None else str(video.views)),
+        channel=_esc(channel[:30]) if channel else "",
+        published=_esc(published) if published else ""
+    )
 
-                if hasattr(video, 'published') and video.published:
-                    st.caption(f"📅 {video.published}")
 
-        st.markdown("---")
+def _video_card_html(video: _PreparedVideo) -> str:
+    """Tarjeta HTML de un video (campos ya escapados)"""
+    thumbnail = f'<img src="{video.thumbnail}" width="120"/>' if video.thumbnail else ""
+
+    if video.link:
+        title = f'<a href="{video.link}" target="_blank"><strong>{video.title}</strong></a>'
+    else:
+        title = f"<strong>{video.title}</strong>"
+
+    published = f"<br><small>📅 {video.published}</small>" if video.published else ""
+
+    return (
+        f'<div class="video-card">{thumbnail}<div>{title}'
+        f'<br><small>👁️ {video.views} · 📺 {video.channel}</small>{published}</div></div>'
+    )
+
+
+def _render_video_list(videos: list, key_prefix: str) -> None:
+    """Renderiza lista de videos en un único bloque HTML"""
+    if not videos:
+        st.info("No se encontraron videos de este tipo")
+        return
+
+    cards = "".join(_video_card_html(_prepare_video(video)) for video in videos[:8])
+
+    st.markdown(
+        '<style>.video-card{display:flex;gap:12px;padding:8px 0;'
+        'border-bottom:1px solid #E5E7EB}.video-card img{border-radius:6px}</style>'
+        + cards,
+        unsafe_allow_html=True
+    )
 
 
 def _render_tiktok_tab(
@@ -310,6 +402,96 @@ def _render_tiktok_tab(
     st.info("Datos de TikTok pendientes de implementar")
 
 
+def _compute_comparison_chart(
+    trends_score: int,
+    yt_score: Optional[int],
+    tt_score: Optional[int],
+    social_score: Optional[int]
+) -> Optional[dict]:
+    """
+    Figura (dict plano) de la comparativa de scores por fuente
+
+    Devuelve None si solo hay datos de Google Trends.
+    """
+    # Datos para el gráfico (columnas paralelas: una entrada por fuente)
+    fuentes = ["Google Trends"]
+    scores = [trends_score]
+    tipos = ["Búsquedas"]
+
+    if yt_score is not None:
+        fuentes.append("YouTube")
+        scores.append(yt_score)
+        tipos.append("Contenido")
+
+    if tt_score is not None:
+        fuentes.append("TikTok")
+        scores.append(tt_score)
+        tipos.append("Viralidad")
+
+    if social_score is not None:
+        fuentes.append("Social Score")
+        scores.append(social_score)
+        tipos.append("Combinado")
+
+    if len(fuentes) < 2:
+        return None
+
+    # Una sola traza con color por barra; la leyenda se mantiene con trazas
+    # vacías (x=[None]) por tipo, que no dibujan nada
+    bars = {
+        "type": "bar",
+        "x": fuentes,
+        "y": scores,
+        "marker": {"color": [_COMPARISON_COLORS[tipo] for tipo in tipos]},
+        "showlegend": False
+    }
+    legend = [
+        {"type": "bar", "name": tipo, "x": [None], "y": [None], "marker": {"color": _COMPARISON_COLORS[tipo]}}
+        for tipo in dict.fromkeys(tipos)
+    ]
+
+    return {
+        "data": [bars] + legend,
+        "layout": {
+            "title": {"text": "Comparativa de Scores por Fuente"},
+            "xaxis": {"title": {"text": "Fuente"}},
+            "yaxis": {"title": {"text": "Score"}},
+            "height": 350,
+            "showlegend": True,
+            "uirevision": "compare",
+            "shapes": [{
+                "type": "line", "xref": "paper", "x0": 0, "x1": 1, "y0": 50, "y1": 50,
+                "line": {"dash": "dash", "color": "gray"}, "opacity": 0.5
+            }]
+        }
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def _build_quadrant_layout() -> dict:
+    """
+    Layout base de la matriz de oportunidad (cuadrantes, etiquetas y ejes)
+
+    Es estático: se construye una vez y se comparte entre renders; no mutar.
+    """
+    return {
+        "shapes": [
+            {"type": "rect", "x0": x0, "y0": y0, "x1": x1, "y1": y1, "fillcolor": color, "line": {"width": 0}}
+            for (x0, y0, x1, y1), color in _QUADRANT_RECTS
+        ],
+        "annotations": [
+            {"x": x, "y": y, "text": text, "showarrow": False, "font": {"size": 12}}
+            for x, y, text in _QUADRANT_LABELS
+        ],
+        "xaxis": {"title": {"text": "Google Trends Score"}, "range": [0, 100]},
+        "yaxis": {"title": {"text": "Social Score (YouTube)"}, "range": [0, 100]},
+        "height": 400,
+        "showlegend": False,
+        # Constante: los reruns no resetean zoom/estado del gráfico en el cliente
+        "uirevision": "quadrant"
+    }
+
+
 def _render_comparison_tab(
     trends_score: int,
     youtube_metrics: Optional[Any],
@@ -317,58 +499,15 @@ def _render_comparison_tab(
     social_metrics: Optional[Any]
 ) -> None:
     """Renderiza comparativa entre plataformas"""
-
     st.markdown("#### 📊 Comparativa de Señales")
 
-    # Datos para el gráfico
-    data = []
-
-    data.append({
-        "Fuente": "Google Trends",
-        "Score": trends_score,
-        "Tipo": "Búsquedas"
-    })
-
-    if youtube_metrics:
-        data.append({
-            "Fuente": "YouTube",
-            "Score": youtube_metrics.content_score,
-            "Tipo": "Contenido"
-        })
-
-    if tiktok_metrics:
-        data.append({
-            "Fuente": "TikTok",
-            "Score": tiktok_metrics.viral_score,
-            "Tipo": "Viralidad"
-        })
-
-    if social_metrics:
-        data.append({
-            "Fuente": "Social Score",
-            "Score": social_metrics.social_score,
-            "Tipo": "Combinado"
-        })
-
-    if len(data) > 1:
-        df = pd.DataFrame(data)
-
-        fig = px.bar(
-            df,
-            x="Fuente",
-            y="Score",
-            color="Tipo",
-            title="Comparativa de Scores por Fuente",
-            color_discrete_map={
-                "Búsquedas": "#7C3AED",
-                "Contenido": "#EF4444",
-                "Viralidad": "#10B981",
-                "Combinado": "#F59E0B"
-            }
-        )
-        fig.update_layout(height=350, showlegend=True)
-        fig.add_hline(y=50, line_dash="dash", line_color="gray", opacity=0.5)
-
+    fig = _compute_comparison_chart(
+        trends_score,
+        youtube_metrics.content_score if youtube_metrics else None,
+        tiktok_metrics.viral_score if tiktok_metrics else None,
+        social_metrics.social_score if social_metrics else None
+    )
+    if fig:
         st.plotly_chart(fig, width="stretch")
 
     # Matriz de decisión visual
@@ -379,49 +518,20 @@ def _render_comparison_tab(
     col1, col2 = st.columns(2)
 
     with col1:
-        # Cuadrante
-        fig = go.Figure()
-
-        # Punto actual
-        fig.add_trace(go.Scatter(
-            x=[trends_score],
-            y=[yt_score],
-            mode='markers+text',
-            marker=dict(size=20, color='#7C3AED'),
-            text=['Posición actual'],
-            textposition='top center'
-        ))
-
-        # Cuadrantes
-        fig.add_shape(
-            type="rect", x0=0, y0=50, x1=50, y1=100,
-            fillcolor="rgba(16, 185, 129, 0.2)", line_width=0
-        )
-        fig.add_shape(
-            type="rect", x0=50, y0=50, x1=100, y1=100,
-            fillcolor="rgba(245, 158, 11, 0.2)", line_width=0
-        )
-        fig.add_shape(
-            type="rect", x0=0, y0=0, x1=50, y1=50,
-            fillcolor="rgba(239, 68, 68, 0.2)", line_width=0
-        )
-        fig.add_shape(
-            type="rect", x0=50, y0=0, x1=100, y1=50,
-            fillcolor="rgba(59, 130, 246, 0.2)", line_width=0
-        )
-
-        # Etiquetas de cuadrantes
-        fig.add_annotation(x=25, y=75, text="🚀 OPORTUNIDAD", showarrow=False, font=dict(size=12))
-        fig.add_annotation(x=75, y=75, text="📈 ESTABLECIDO", showarrow=False, font=dict(size=12))
-        fig.add_annotation(x=25, y=25, text="📉 BAJA TRACCIÓN", showarrow=False, font=dict(size=12))
-        fig.add_annotation(x=75, y=25, text="📝 GAP CONTENIDO", showarrow=False, font=dict(size=12))
-
-        fig.update_layout(
-            xaxis=dict(title="Google Trends Score", range=[0, 100]),
-            yaxis=dict(title="Social Score (YouTube)", range=[0, 100]),
-            height=400,
-            showlegend=False
-        )
+        # Cuadrante: layout estático cacheado + punto actual (dict plano).
+        # scatter (SVG): para un solo punto no compensa abrir un contexto WebGL
+        fig = {
+            "data": [{
+                "type": "scatter",
+                "x": [trends_score],
+                "y": [yt_score],
+                "mode": "markers+text",
+                "marker": {"size": 20, "color": "#7C3AED"},
+                "text": ["Posición actual"],
+                "textposition": "top center"
+            }],
+            "layout": _build_quadrant_layout()
+        }
 
         st.plotly_chart(fig, width="stretch")
 
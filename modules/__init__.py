@@ -9,7 +9,7 @@ from .serp_paa import PeopleAlsoAskModule
 from .google_news import GoogleNewsModule
 from .product_analysis import ProductAnalyzer, ProductData, OpportunityCategory, LifecycleStage
 from .scoring import ScoringEngine
-from .ai_analysis import AIAnalyzer
+from .ai_analysis import AIAnalyzer, get_ai_provider_info
 from .search_volume import SearchVolumeEstimator, estimate_from_trends_data
 from .aliexpress import AliExpressModule, check_aliexpress_config, get_aliexpress_module
 from .youtube import YouTubeModule, YouTubeVideo, YouTubeMetrics, check_youtube_config, get_youtube_module
@@ -27,6 +27,7 @@ __all__ = [
     'LifecycleStage',
     'ScoringEngine',
     'AIAnalyzer',
+    'get_ai_provider_info',
     'SearchVolumeEstimator',
     'estimate_from_trends_data',
     'AliExpressModule',
@@ -3,7 +3,7 @@ AI Analysis Module
 Orquestador que gestiona múltiples proveedores de IA
 """
 
-from typing import Optional, Literal
+from typing import Optional, Literal, Iterator, Tuple
 import streamlit as st
 
 from .providers import ClaudeProvider, OpenAIProvider, PerplexityProvider
@@ -115,6 +115,65 @@ class AIAnalyzer:
             "error": analysis_result.get("error") or blog_result.get("error")
         }
 
+    def resolve_provider(self, provider: ProviderType = "claude") -> Optional[str]:
+        """
+        Devuelve el proveedor a usar: el pedido si está disponible,
+        si no el primero configurado (None si no hay ninguno)
+        """
+        if provider in self.providers:
+            return provider
+
+        available = self.get_available_providers()
+        return available[0] if available else None
+
+    def analyze_stream(
+        self,
+        trend_data: dict,
+        provider: ProviderType = "claude"
+    ) -> Iterator[str]:
+        """
+        Ejecuta el análisis devolviendo el texto a medida que lo genera el modelo
+
+        Las ideas de blog no se incluyen; se piden aparte con
+        generate_blog_ideas() cuando termina el stream.
+
+        Args:
+            trend_data: Diccionario con todos los datos de tendencia
+            provider: Proveedor a usar (claude, gpt4, perplexity)
+
+        Yields:
+            Fragmentos de texto del análisis
+        """
+        provider = self.resolve_provider(provider)
+        if provider is None:
+            raise RuntimeError("No hay proveedores de IA configurados")
+
+        yield from self.providers[provider].analyze_trend_stream(trend_data)
+
+    def generate_blog_ideas(
+        self,
+        trend_data: dict,
+        provider: ProviderType = "claude"
+    ) -> dict:
+        """Genera ideas de blog con el proveedor seleccionado"""
+        provider = self.resolve_provider(provider)
+        if provider is None:
+            return {
+                "success": False,
+                "ideas": [],
+                "error": "No hay proveedores de IA configurados"
+            }
+
+        return self.providers[provider].generate_blog_ideas(
+            trend_data,
+            trend_data.get("keyword", "")
+        )
+
+    def get_provider_name(self, provider: ProviderType = "claude") -> str:
+        """Nombre legible del proveedor que se usará realmente"""
+        resolved = self.resolve_provider(provider) or provider
+        return self.PROVIDER_NAMES.get(resolved, resolved)
+
     def explain_seasonality(
         self,
         seasonality_data: dict,
@@ -163,12 +222,27 @@ class AIAnalyzer:
         }
 
 
+@st.cache_resource(show_spinner=False)
+def get_ai_provider_info() -> Tuple[AIAnalyzer, list]:
+    """
+    AIAnalyzer compartido y lista de proveedores disponibles
+
+    Los proveedores dependen solo de las API keys de secrets, que no cambian
+    en ejecución: se detectan una vez en lugar de en cada rerun.
+
+    Returns:
+        Tupla (analyzer, proveedores disponibles)
+    """
+    analyzer = AIAnalyzer()
+    return analyzer, analyzer.get_available_providers()
+
+
 def render_provider_selector() -> str:
     """
     Renderiza un selector de proveedores de IA en Streamlit con info de costos
     Returns: El proveedor seleccionado
     """
-    analyzer = AIAnalyzer()
+    analyzer, _ = get_ai_provider_info()
     status = analyzer.get_provider_status()
 
     # Información de precios por proveedor (por 1M tokens, actualizado 2025)
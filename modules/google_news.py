@@ -39,8 +39,10 @@ class GoogleNewsModule:
         "GB": "en"
     }
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
+        # Sesión compartida (keep-alive); si no se pasa, una propia
+        self.session = session or requests.Session()
 
     def search_news(
         self,
@@ -78,7 +80,7 @@ class GoogleNewsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -230,7 +232,7 @@ class GoogleNewsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -274,7 +276,7 @@ class GoogleNewsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -322,7 +324,7 @@ class GoogleNewsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -11,6 +11,7 @@ APIs utilizadas:
 """
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List
 from datetime import datetime, timedelta
 import streamlit as st
@@ -60,8 +61,10 @@ class GoogleTrendsModule:
         "fire", "ice", "shadow", "dark", "light", "black", "red"
     ]
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
+        # Sesión compartida (keep-alive); si no se pasa, una propia
+        self.session = session or requests.Session()
 
     def test_connection(self) -> tuple:
         """
@@ -82,7 +85,7 @@ class GoogleTrendsModule:
                 "api_key": self.api_key
             }
             
-            response = requests.get(
+            response = self.session.get(
                 self.BASE_URL,
                 params=params,
                 timeout=10
@@ -197,7 +200,7 @@ class GoogleTrendsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -273,7 +276,7 @@ class GoogleTrendsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -316,7 +319,7 @@ class GoogleTrendsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -333,6 +336,24 @@ class GoogleTrendsModule:
                 "error": str(e)
             }
 
+    def get_country_data(
+        self,
+        country: str,
+        keyword: str,
+        timeframe: str = "today 12-m"
+    ) -> dict:
+        """
+        Obtiene el interés a lo largo del tiempo para un único país
+
+        Args:
+            country: Código de país (ES, PT, FR, IT, DE)
+        """
+        return self.get_interest_over_time(
+            keyword=keyword,
+            geo=country,
+            timeframe=timeframe
+        )
+
     def get_multi_country_data(
         self,
         keyword: str,
@@ -342,21 +363,24 @@ class GoogleTrendsModule:
         """
         Obtiene datos de tendencia para múltiples países
 
+        Las consultas por país son independientes, así que se lanzan en
+        paralelo (latencia ≈ la del país más lento, no la suma).
+
         Args:
             countries: Lista de códigos de país (ES, PT, FR, IT, DE)
         """
         if countries is None:
             countries = ["ES", "PT", "FR", "IT", "DE"]
 
-        results = {}
+        if not countries:
+            return {"success": True, "countries": {}, "keyword": keyword}
 
-        for country in countries:
-            data = self.get_interest_over_time(
-                keyword=keyword,
-                geo=country,
-                timeframe=timeframe
+        with ThreadPoolExecutor(max_workers=len(countries)) as executor:
+            data = executor.map(
+                lambda country: self.get_country_data(country, keyword, timeframe),
+                countries
             )
-            results[country] = data
+            results = dict(zip(countries, data))
 
         return {
             "success": True,
@@ -400,7 +424,7 @@ class GoogleTrendsModule:
             params["only_active"] = "true"
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -435,7 +459,7 @@ class GoogleTrendsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -473,7 +497,7 @@ class GoogleTrendsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -499,12 +523,37 @@ class GoogleTrendsModule:
         return result
 
 
-def calculate_growth_rate(timeline_data: list) -> dict:
+def extract_timeline_values(timeline_data: list) -> List[float]:
+    """
+    Extrae los valores numéricos del timeline en una sola pasada
+
+    El resultado se puede pasar a calculate_growth_rate y al ScoringEngine
+    para no recorrer el timeline una vez por cálculo.
+
+    Args:
+        timeline_data: Datos del timeline de Google Trends
+
+    Returns:
+        Lista de valores (0 si el punto no tiene valor válido)
+    """
+    values = []
+    for point in timeline_data or []:
+        if "values" in point and len(point["values"]) > 0:
+            val = point["values"][0].get("extracted_value", 0)
+            try:
+                values.append(float(val) if val else 0)
+            except (ValueError, TypeError):
+                values.append(0)
+    return values
+
+
+def calculate_growth_rate(timeline_data: list, values: Optional[List[float]] = None) -> dict:
     """
     Calcula la tasa de crecimiento de una serie temporal
 
     Args:
         timeline_data: Datos del timeline de Google Trends
+        values: Valores ya extraídos con extract_timeline_values (opcional)
 
     Returns:
         Dict con current_value, avg_value, growth_rate, peak_value
@@ -518,14 +567,8 @@ def calculate_growth_rate(timeline_data: list) -> dict:
         }
 
     # Extraer valores
-    values = []
-    for point in timeline_data:
-        if "values" in point and len(point["values"]) > 0:
-            val = point["values"][0].get("extracted_value", 0)
-            try:
-                values.append(float(val) if val else 0)
-            except (ValueError, TypeError):
-                values.append(0)
+    if values is None:
+        values = extract_timeline_values(timeline_data)
 
     if not values:
         return {
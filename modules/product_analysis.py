@@ -11,6 +11,7 @@ Funcionalidades:
 
 import re
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -74,8 +75,16 @@ class ProductAnalyzer:
     VOLUME_THRESHOLD = 50  # Índice de volumen para considerar "alto"
     GROWTH_THRESHOLD = 15  # % de crecimiento para considerar "alto"
 
-    def __init__(self, api_key: str):
+    # Peticiones simultáneas a SerpAPI como máximo (respeta el rate limit)
+    MAX_CONCURRENT_REQUESTS = 4
+
+    # Productos por comparación (límite de Google Trends)
+    COMPARISON_BATCH_SIZE = 5
+
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
+        # Sesión compartida (keep-alive); si no se pasa, una propia
+        self.session = session or requests.Session()
 
     def detect_products(
         self,
@@ -194,6 +203,38 @@ class ProductAnalyzer:
                     pass
         return 0.0
 
+    def merge_related_queries(self, rising: List[dict], top: List[dict]) -> List[dict]:
+        """
+        Combina queries rising y top sin duplicados
+
+        Las rising se ordenan por crecimiento (Breakout primero) y van delante
+        de las top, para que al limitar a max_products sobrevivan los productos
+        más prometedores. Los duplicados se detectan por texto sin distinguir
+        mayúsculas y se conserva la primera aparición.
+
+        Args:
+            rising: Queries en crecimiento de Google Trends
+            top: Queries top de Google Trends
+
+        Returns:
+            Lista de queries únicas
+        """
+        rising_sorted = sorted(
+            rising or [],
+            key=lambda q: self._safe_extract_value(q.get("extracted_value", 0) if isinstance(q, dict) else 0),
+            reverse=True
+        )
+
+        merged = []
+        seen = set()
+        for q in rising_sorted + (top or []):
+            query_text = (q.get("query", "") if isinstance(q, dict) else str(q)).strip().lower()
+            if query_text and query_text not in seen:
+                seen.add(query_text)
+                merged.append(q)
+
+        return merged
+
     def get_products_comparison(
         self,
         brand: str,
@@ -228,7 +269,7 @@ class ProductAnalyzer:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -399,7 +440,7 @@ class ProductAnalyzer:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -540,12 +581,19 @@ class ProductAnalyzer:
         all_products = []
         shopping_products = []
 
-        # 1. Detectar productos desde queries relacionadas
-        trend_products = self.detect_products(brand, related_queries)
-        all_products.extend(trend_products)
+        # Autocomplete y Shopping no dependen de nada: se lanzan ya en paralelo
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            autocomplete_future = executor.submit(self._get_autocomplete, brand, geo)
+            shopping_future = executor.submit(self.get_shopping_products, brand, geo) if include_shopping else None
+
+            # 1. Detectar productos desde queries relacionadas
+            trend_products = self.detect_products(brand, related_queries)
+            all_products.extend(trend_products)
+
+            autocomplete_suggestions = autocomplete_future.result()
+            shopping_result = shopping_future.result() if shopping_future else {}
 
-        # 2. Obtener autocomplete para más sugerencias
-        autocomplete_suggestions = self._get_autocomplete(brand, geo)
+        # 2. Añadir productos del autocomplete
         if autocomplete_suggestions:
             autocomplete_products = self.detect_products(
                 brand,
@@ -559,23 +607,21 @@ class ProductAnalyzer:
                     existing_names.add(p.name.lower())
 
         # 3. Obtener productos de Google Shopping (datos reales)
-        if include_shopping:
-            shopping_result = self.get_shopping_products(brand, geo)
-            if shopping_result.get("success"):
-                shopping_products = shopping_result.get("products", [])
-
-                # Extraer nombres de productos de Shopping
-                for sp in shopping_products:
-                    product_name = self._extract_product_from_shopping(sp.get("title", ""), brand)
-                    if product_name:
-                        existing_names = {p.name.lower() for p in all_products}
-                        if product_name.lower() not in existing_names:
-                            all_products.append(ProductData(
-                                name=product_name.upper(),
-                                full_query=sp.get("title", ""),
-                                volume=0,  # Se actualizará con trends
-                                growth=0
-                            ))
+        if shopping_result.get("success"):
+            shopping_products = shopping_result.get("products", [])
+
+            # Extraer nombres de productos de Shopping
+            for sp in shopping_products:
+                product_name = self._extract_product_from_shopping(sp.get("title", ""), brand)
+                if product_name:
+                    existing_names = {p.name.lower() for p in all_products}
+                    if product_name.lower() not in existing_names:
+                        all_products.append(ProductData(
+                            name=product_name.upper(),
+                            full_query=sp.get("title", ""),
+                            volume=0,  # Se actualizará con trends
+                            growth=0
+                        ))
 
         # Limitar productos
         all_products = all_products[:max_products]
@@ -596,11 +642,21 @@ class ProductAnalyzer:
                 }
             }
 
-        # 4. Obtener datos comparativos de tendencias (máx 5 a la vez por limitación de API)
+        # 4. Obtener datos comparativos de tendencias (máx 5 por consulta por limitación de API)
+        # Los lotes se consultan en paralelo, con MAX_CONCURRENT_REQUESTS como tope
+        batches = [
+            all_products[i:i + self.COMPARISON_BATCH_SIZE]
+            for i in range(0, len(all_products), self.COMPARISON_BATCH_SIZE)
+        ]
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_REQUESTS, len(batches))) as executor:
+            comparison_results = list(executor.map(
+                lambda batch: self.get_products_comparison(brand, batch, geo, timeframe),
+                batches
+            ))
+
         products_with_data = []
-        for i in range(0, len(all_products), 5):
-            batch = all_products[i:i+5]
-            comparison_result = self.get_products_comparison(brand, batch, geo, timeframe)
+        for batch, comparison_result in zip(batches, comparison_results):
             if comparison_result.get("success"):
                 products_with_data.extend(comparison_result.get("products", batch))
             else:
@@ -644,7 +700,7 @@ class ProductAnalyzer:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=15)
+            response = self.session.get(self.BASE_URL, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
 
@@ -732,7 +788,7 @@ class ProductAnalyzer:
             }
 
             try:
-                response = requests.get(self.BASE_URL, params=params, timeout=15)
+                response = self.session.get(self.BASE_URL, params=params, timeout=15)
                 if response.status_code == 200:
                     data = response.json()
                     for item in data.get("shopping_results", []):
@@ -5,7 +5,7 @@ Define la interfaz común que todos los proveedores deben implementar.
 """
 
 from abc import ABC, abstractmethod
-from typing import Tuple, Dict, Any, Optional
+from typing import Tuple, Dict, Any, Optional, Iterator
 
 
 class BaseAIProvider(ABC):
@@ -56,6 +56,19 @@ class BaseAIProvider(ABC):
         """
         pass
     
+    @abstractmethod
+    def analyze_trend_stream(self, trend_data: dict) -> Iterator[str]:
+        """
+        Analiza datos de tendencia devolviendo el texto por fragmentos.
+        
+        Args:
+            trend_data: Diccionario con datos de tendencia
+            
+        Yields:
+            Fragmentos de texto del análisis a medida que llegan
+        """
+        pass
+    
     @abstractmethod
     def generate_blog_ideas(self, trend_data: dict, brand: str) -> dict:
         """
@@ -3,7 +3,7 @@ Claude Provider
 Integración con Anthropic Claude API (2024-2025)
 """
 
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Iterator
 import json
 
 
@@ -91,6 +91,25 @@ class ClaudeProvider:
                 "provider": "Claude 4.5"
             }
 
+    def analyze_trend_stream(self, trend_data: dict) -> Iterator[str]:
+        """
+        Igual que analyze_trend pero devuelve el texto a medida que llega
+        """
+        prompt = self._build_analysis_prompt(trend_data)
+
+        with self.client.messages.stream(
+            model=self.MODEL,
+            max_tokens=1500,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
+
     def generate_blog_ideas(self, trend_data: dict, brand: str) -> dict:
         """
         Genera ideas para posts de blog basándose en los datos
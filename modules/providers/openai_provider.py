@@ -3,7 +3,7 @@ OpenAI Provider
 Integración con OpenAI GPT-4o API (2024-2025)
 """
 
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Iterator
 import json
 
 
@@ -94,6 +94,32 @@ class OpenAIProvider:
                 "provider": "GPT-4o"
             }
 
+    def analyze_trend_stream(self, trend_data: dict) -> Iterator[str]:
+        """
+        Igual que analyze_trend pero devuelve el texto a medida que llega
+        """
+        prompt = self._build_analysis_prompt(trend_data)
+
+        stream = self.client.chat.completions.create(
+            model=self.MODEL,
+            max_tokens=1500,
+            stream=True,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Eres un analista de tendencias de mercado especializado en retail de tecnología. Proporcionas insights accionables y directos."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        )
+
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     def generate_blog_ideas(self, trend_data: dict, brand: str) -> dict:
         """
         Genera ideas para posts de blog basándose en los datos
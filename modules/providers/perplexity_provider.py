@@ -3,7 +3,7 @@ Perplexity Provider
 Integración con Perplexity API
 """
 
-from typing import Optional
+from typing import Optional, Iterator
 import json
 import requests
 
@@ -70,6 +70,59 @@ class PerplexityProvider:
                 "provider": "Perplexity"
             }
 
+    def analyze_trend_stream(self, trend_data: dict) -> Iterator[str]:
+        """
+        Igual que analyze_trend pero devuelve el texto a medida que llega
+        (Server-Sent Events con "stream": true)
+        """
+        prompt = self._build_analysis_prompt(trend_data)
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": self.MODEL,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "Eres un analista de tendencias de mercado especializado en retail de tecnología. Proporcionas insights accionables basados en datos y búsquedas en tiempo real."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": 1500,
+            "stream": True
+        }
+
+        with requests.post(
+            self.BASE_URL,
+            headers=headers,
+            json=payload,
+            timeout=60,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+
+                try:
+                    delta = json.loads(data)["choices"][0].get("delta", {})
+                except (json.JSONDecodeError, KeyError, IndexError):
+                    continue
+
+                if delta.get("content"):
+                    yield delta["content"]
+
     def generate_blog_ideas(self, trend_data: dict, brand: str) -> dict:
         """
         Genera ideas para posts de blog basándose en los datos
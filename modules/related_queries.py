@@ -17,8 +17,10 @@ class RelatedQueriesModule:
 
     BASE_URL = "https://serpapi.com/search.json"
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
+        # Sesión compartida (keep-alive); si no se pasa, una propia
+        self.session = session or requests.Session()
 
     def get_related_queries(
         self,
@@ -49,7 +51,7 @@ class RelatedQueriesModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -100,7 +102,7 @@ class RelatedQueriesModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
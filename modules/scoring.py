@@ -42,7 +42,8 @@ class ScoringEngine:
         self,
         timeline_data: list,
         related_queries_count: int = 0,
-        paa_count: int = 0
+        paa_count: int = 0,
+        values: Optional[List[float]] = None
     ) -> dict:
         """
         Calcula el Trend Score (0-100)
@@ -53,6 +54,8 @@ class ScoringEngine:
         - Tasa de crecimiento reciente
         - Momentum (aceleración del crecimiento)
         - Consistencia de la tendencia
+
+        values: valores ya extraídos del timeline (evita volver a recorrerlo)
         """
         if not timeline_data:
             return {
@@ -63,7 +66,8 @@ class ScoringEngine:
             }
 
         # Extraer valores
-        values = self._extract_values(timeline_data)
+        if values is None:
+            values = self._extract_values(timeline_data)
 
         if len(values) < 4:
             return {
@@ -131,7 +135,8 @@ class ScoringEngine:
         timeline_data: list,
         rising_queries: list = None,
         current_value: float = 0,
-        is_seasonal: bool = False
+        is_seasonal: bool = False,
+        values: Optional[List[float]] = None
     ) -> dict:
         """
         Calcula el Potential Score (0-100)
@@ -142,6 +147,8 @@ class ScoringEngine:
         - Etapa temprana (valores bajos pero creciendo)
         - Rising queries con alto crecimiento
         - Bajo volumen actual (espacio para crecer)
+
+        values: valores ya extraídos del timeline (evita volver a recorrerlo)
         """
         if not timeline_data:
             return {
@@ -151,7 +158,8 @@ class ScoringEngine:
                 "explanation": "No hay datos suficientes"
             }
 
-        values = self._extract_values(timeline_data)
+        if values is None:
+            values = self._extract_values(timeline_data)
 
         if len(values) < 6:
             return {
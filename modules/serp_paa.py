@@ -35,8 +35,10 @@ class PeopleAlsoAskModule:
         "DE": "de"
     }
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
         self.api_key = api_key
+        # Sesión compartida (keep-alive); si no se pasa, una propia
+        self.session = session or requests.Session()
 
     def get_serp_data(
         self,
@@ -59,7 +61,7 @@ class PeopleAlsoAskModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -99,7 +101,7 @@ class PeopleAlsoAskModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -144,7 +146,7 @@ class PeopleAlsoAskModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=30)
+            response = self.session.get(self.BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -239,6 +239,9 @@ class YouTubeModule:
     SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
     VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
 
+    # Máximo de IDs por llamada a videos.list
+    VIDEOS_BATCH_SIZE = 50
+
     def __init__(self, api_key: str):
         """
         Inicializa el módulo de YouTube
@@ -344,27 +347,27 @@ class YouTubeModule:
         Returns:
             Lista de videos (vacía si hay error)
         """
-        cache_key = f"search_{query}_{order}_{region}_{max_results}"
+        cache_key = self._search_cache_key(query, order, region, max_results)
         if cache_key in self._cache:
             return self._cache[cache_key]
 
-        try:
-            # Paso 1: Buscar videos (obtiene IDs y snippets básicos)
-            video_ids, snippets = self._search_video_ids(
-                query=query,
-                max_results=min(max_results, 50),
-                order=order,
-                region=region,
-                language=language,
-                published_after=published_after
-            )
+        # Paso 1: Buscar videos (obtiene IDs y snippets básicos)
+        video_ids, snippets = self._search_ids(
+            query=query,
+            max_results=max_results,
+            order=order,
+            region=region,
+            language=language,
+            published_after=published_after
+        )
 
-            if not video_ids:
-                # Log para debug
-                if self._last_error:
-                    print(f"[YouTube] No videos found. Last error: {self._last_error}")
-                return []
+        if not video_ids:
+            # Log para debug
+            if self._last_error:
+                print(f"[YouTube] No videos found. Last error: {self._last_error}")
+            return []
 
+        try:
             # Paso 2: Obtener estadísticas de los videos
             stats = self._get_video_statistics(video_ids)
 
@@ -374,14 +377,8 @@ class YouTubeModule:
             self._cache[cache_key] = videos
             return videos
 
-        except requests.exceptions.Timeout:
-            self._last_error = "Timeout: YouTube API no respondió a tiempo"
-            return []
-        except requests.exceptions.ConnectionError:
-            self._last_error = "Error de conexión con YouTube API"
-            return []
         except Exception as e:
-            self._last_error = str(e)
+            self._record_error(e)
             return []
 
     def search_brand(
@@ -406,44 +403,86 @@ class YouTubeModule:
             "general": []
         }
 
-        try:
+        searches = {
             # Búsqueda general (por vistas)
-            results["general"] = self._safe_search(
-                query=brand,
-                max_results=10,
-                order="viewCount",
-                region=geo
-            )
-
+            "general": {"query": brand, "max_results": 10, "order": "viewCount"},
             # Reviews (por relevancia)
-            results["reviews"] = self._safe_search(
-                query=f"{brand} review",
-                max_results=10,
-                order="relevance",
-                region=geo
-            )
-
+            "reviews": {"query": f"{brand} review", "max_results": 10, "order": "relevance"},
             # Unboxings (más recientes)
-            results["unboxings"] = self._safe_search(
-                query=f"{brand} unboxing",
-                max_results=5,
-                order="date",
-                region=geo
-            )
-
+            "unboxings": {"query": f"{brand} unboxing", "max_results": 5, "order": "date"},
             # Comparativas
-            results["comparisons"] = self._safe_search(
-                query=f"{brand} vs",
-                max_results=5,
-                order="viewCount",
-                region=geo
-            )
+            "comparisons": {"query": f"{brand} vs", "max_results": 5, "order": "viewCount"}
+        }
 
+        try:
+            results.update(self._search_batch(searches, region=geo))
         except Exception as e:
             self._last_error = f"Error en búsqueda de marca: {str(e)}"
 
         return results
 
+    def _search_batch(
+        self,
+        searches: Dict[str, dict],
+        region: str = "ES",
+        language: str = "es"
+    ) -> Dict[str, List[YouTubeVideo]]:
+        """
+        Ejecuta varias búsquedas compartiendo la consulta de estadísticas
+
+        Cada búsqueda hace su search.list, pero las estadísticas de todos los
+        videos se piden juntas (videos.list admite 50 IDs por llamada) en
+        lugar de una llamada por búsqueda.
+
+        Args:
+            searches: Dict nombre -> parámetros (query, max_results, order)
+            region: Código de país ISO
+            language: Código de idioma ISO
+
+        Returns:
+            Dict nombre -> lista de videos (vacía si hay error)
+        """
+        results = {}
+        pending = {}
+        all_snippets = {}
+
+        # Paso 1: Buscar IDs de cada búsqueda (las cacheadas no tocan la API)
+        for name, search in searches.items():
+            cache_key = self._search_cache_key(search["query"], search["order"], region, search["max_results"])
+            if cache_key in self._cache:
+                results[name] = self._cache[cache_key]
+                continue
+
+            video_ids, snippets = self._search_ids(
+                query=search["query"],
+                max_results=search["max_results"],
+                order=search["order"],
+                region=region,
+                language=language
+            )
+
+            results[name] = []
+            if video_ids:
+                pending[name] = (cache_key, video_ids)
+                all_snippets.update(snippets)
+
+        if not pending:
+            return results
+
+        # Paso 2: Estadísticas de todos los videos únicos en lotes de 50
+        unique_ids = list(dict.fromkeys(
+            video_id for _, video_ids in pending.values() for video_id in video_ids
+        ))
+        stats = self._get_video_statistics(unique_ids)
+
+        # Paso 3: Combinar datos por búsqueda
+        for name, (cache_key, video_ids) in pending.items():
+            videos = self._combine_data(video_ids, all_snippets, stats)
+            self._cache[cache_key] = videos
+            results[name] = videos
+
+        return results
+
     def get_recent_videos(
         self,
         query: str,
@@ -562,12 +601,47 @@ class YouTubeModule:
         except Exception as e:
             return YouTubeMetrics(keyword=brand, api_error=str(e))
 
-    def _safe_search(self, **kwargs) -> List[YouTubeVideo]:
-        """Wrapper seguro para search_videos"""
+    @staticmethod
+    def _search_cache_key(query: str, order: str, region: str, max_results: int) -> str:
+        """Clave de caché de una búsqueda (compartida por search_videos y _search_batch)"""
+        return f"search_{query}_{order}_{region}_{max_results}"
+
+    def _record_error(self, error: Exception) -> None:
+        """Guarda en _last_error un mensaje legible para el error de una petición"""
+        if isinstance(error, requests.exceptions.Timeout):
+            self._last_error = "Timeout: YouTube API no respondió a tiempo"
+        elif isinstance(error, requests.exceptions.ConnectionError):
+            self._last_error = "Error de conexión con YouTube API"
+        else:
+            self._last_error = str(error)
+
+    def _search_ids(
+        self,
+        query: str,
+        max_results: int,
+        order: str,
+        region: str,
+        language: str,
+        published_after: Optional[datetime] = None
+    ) -> Tuple[List[str], Dict[str, dict]]:
+        """
+        _search_video_ids sin excepciones: los errores quedan en _last_error
+
+        Returns:
+            Tuple de (lista de IDs, dict de snippets por ID); vacíos si hay error
+        """
         try:
-            return self.search_videos(**kwargs)
-        except Exception:
-            return []
+            return self._search_video_ids(
+                query=query,
+                max_results=min(max_results, 50),
+                order=order,
+                region=region,
+                language=language,
+                published_after=published_after
+            )
+        except Exception as e:
+            self._record_error(e)
+            return [], {}
 
     def _search_video_ids(
         self,
@@ -652,37 +726,36 @@ class YouTubeModule:
         Returns:
             Dict de estadísticas por ID
         """
-        if not video_ids:
-            return {}
+        stats = {}
 
         # La API permite hasta 50 IDs por llamada
-        params = {
-            "part": "statistics,contentDetails",
-            "id": ",".join(video_ids[:50]),
-            "key": self.api_key
-        }
+        for i in range(0, len(video_ids), self.VIDEOS_BATCH_SIZE):
+            params = {
+                "part": "statistics,contentDetails",
+                "id": ",".join(video_ids[i:i + self.VIDEOS_BATCH_SIZE]),
+                "key": self.api_key
+            }
 
-        try:
-            response = requests.get(self.VIDEOS_URL, params=params, timeout=10)
+            try:
+                response = requests.get(self.VIDEOS_URL, params=params, timeout=10)
 
-            if response.status_code != 200:
-                return {}
+                if response.status_code != 200:
+                    continue
 
-            data = response.json()
-            stats = {}
+                data = response.json()
 
-            for item in data.get("items", []):
-                video_id = item.get("id")
-                if video_id:
-                    stats[video_id] = {
-                        "statistics": item.get("statistics", {}),
-                        "contentDetails": item.get("contentDetails", {})
-                    }
+                for item in data.get("items", []):
+                    video_id = item.get("id")
+                    if video_id:
+                        stats[video_id] = {
+                            "statistics": item.get("statistics", {}),
+                            "contentDetails": item.get("contentDetails", {})
+                        }
 
-            return stats
+            except Exception:
+                continue
 
-        except Exception:
-            return {}
+        return stats
 
     def _combine_data(
         self,
@@ -204,6 +204,269 @@ def test_product_analyzer():
     return True
 
 
+def test_multi_country_order():
+    """Test que get_multi_country_data conserva el orden de países con el pool de hilos"""
+    import time
+    from modules.google_trends import GoogleTrendsModule
+
+    module = GoogleTrendsModule(api_key="test")
+    countries = ["ES", "PT", "FR", "IT", "DE"]
+    delays = {"ES": 0.05, "PT": 0.0, "FR": 0.04, "IT": 0.01, "DE": 0.02}
+
+    # Los primeros países terminan los últimos: el orden no depende de quién acaba antes
+    def fake_country_data(country, keyword, timeframe):
+        time.sleep(delays[country])
+        return {"success": True, "country": country}
+
+    module.get_country_data = fake_country_data
+    result = module.get_multi_country_data("mini pc", countries=countries)
+
+    assert result["success"], "get_multi_country_data debería devolver success"
+    assert list(result["countries"]) == countries, "El orden de países no se conserva"
+    assert all(data["country"] == country for country, data in result["countries"].items()), \
+        "Cada país debería tener sus propios datos"
+
+    print("✅ get_multi_country_data conserva el orden de países")
+
+
+def test_store_analysis_eviction():
+    """Test que store_analysis descarta el análisis más antiguo al superar ANALYSIS_CACHE_MAX"""
+    from app import store_analysis, ANALYSIS_CACHE_MAX
+
+    cache = {}
+    for i in range(ANALYSIS_CACHE_MAX + 2):
+        store_analysis(cache, (f"kw{i}", "ES"), {"n": i})
+
+    assert len(cache) == ANALYSIS_CACHE_MAX, "La caché debería limitarse a ANALYSIS_CACHE_MAX"
+    assert ("kw0", "ES") not in cache and ("kw1", "ES") not in cache, "Deberían salir los más antiguos"
+    assert list(cache)[-1] == (f"kw{ANALYSIS_CACHE_MAX + 1}", "ES"), "El último análisis debería quedarse"
+
+    # Volver a guardar una clave existente no descarta nada
+    store_analysis(cache, ("kw2", "ES"), {"n": 99})
+    assert len(cache) == ANALYSIS_CACHE_MAX and cache[("kw2", "ES")] == {"n": 99}
+
+    print("✅ store_analysis respeta ANALYSIS_CACHE_MAX")
+
+
+def test_merge_related_queries():
+    """Test combinación de queries rising + top (orden y duplicados)"""
+    from modules.product_analysis import ProductAnalyzer
+
+    analyzer = ProductAnalyzer(api_key="test")
+
+    rising = [
+        {"query": "Beelink SER5", "extracted_value": 150},
+        {"query": "Beelink GTR7", "extracted_value": "Breakout"},
+        {"query": "beelink eq12", "extracted_value": 300},
+    ]
+    top = [
+        {"query": "beelink ser5", "extracted_value": 100},
+        {"query": "Beelink EQ12 ", "extracted_value": 90},
+        {"query": "beelink mini pc", "extracted_value": 80},
+    ]
+
+    merged = [q["query"] for q in analyzer.merge_related_queries(rising, top)]
+
+    # Rising por crecimiento (Breakout primero), luego top; sin duplicados por mayúsculas/espacios
+    assert merged == ["Beelink GTR7", "beelink eq12", "Beelink SER5", "beelink mini pc"], merged
+    assert analyzer.merge_related_queries(None, None) == [], "Listas vacías deberían dar []"
+
+    print("✅ merge_related_queries ordena y elimina duplicados")
+
+
+def test_timeline_values_reuse():
+    """Test que pasar values= precalculados da el mismo resultado que el timeline"""
+    from modules.google_trends import extract_timeline_values, calculate_growth_rate
+    from modules.scoring import ScoringEngine
+
+    timeline = [
+        {"date": f"2024-{i:02d}", "values": [{"extracted_value": v}]}
+        for i, v in enumerate([20, 0, 35, None, 40, "55", 60, 70, 65, 80, 90, 85, 95], 1)
+    ]
+    timeline.append({"date": "sin valores", "values": []})
+
+    values = extract_timeline_values(timeline)
+    assert values == [20, 0, 35, 0, 40, 55, 60, 70, 65, 80, 90, 85, 95], values
+    assert extract_timeline_values(None) == []
+    assert extract_timeline_values([{"values": [{"extracted_value": "x"}]}]) == [0]
+
+    assert calculate_growth_rate(timeline, values=values) == calculate_growth_rate(timeline)
+
+    engine = ScoringEngine()
+    assert engine.calculate_trend_score(timeline, related_queries_count=3, values=values) == \
+        engine.calculate_trend_score(timeline, related_queries_count=3)
+
+    rising = [{"query": "a", "extracted_value": "Breakout"}, {"query": "b", "extracted_value": 250}]
+    assert engine.calculate_potential_score(timeline, rising, current_value=95, values=values) == \
+        engine.calculate_potential_score(timeline, rising, current_value=95)
+
+    print("✅ extract_timeline_values reutilizable en crecimiento y scores")
+
+
+def test_format_number():
+    """Test que format_number (cacheado) mantiene los formatos K/M/B"""
+    from utils.helpers import format_number
+
+    cases = {
+        None: "0",
+        "abc": "0",
+        0: "0",
+        999: "999",
+        999.9: "999",
+        1_000: "1.0K",
+        1_500: "1.5K",
+        "2500": "2.5K",
+        999_999: "1000.0K",
+        1_000_000: "1.0M",
+        2_345_678: "2.3M",
+        1_000_000_000: "1.0B",
+        7_250_000_000: "7.2B",
+        -5_000: "-5000",
+    }
+
+    for num, expected in cases.items():
+        # Dos veces: la segunda sale de la caché
+        for _ in range(2):
+            result = format_number(num)
+            assert result == expected, f"format_number({num!r}) = {result!r}, esperado {expected!r}"
+
+    print("✅ format_number mantiene sus formatos")
+
+
+def test_comparison_chart_payload():
+    """Test forma de la figura (dict) de la comparativa social"""
+    from components.social_media_panel import _compute_comparison_chart, _COMPARISON_COLORS
+
+    # Solo Google Trends: no hay nada que comparar
+    assert _compute_comparison_chart(50, None, None, None) is None
+
+    fig = _compute_comparison_chart(60, 40, None, 70)
+    assert set(fig) == {"data", "layout"}
+
+    bars, *legend = fig["data"]
+    assert bars["type"] == "bar" and bars["showlegend"] is False
+    assert bars["x"] == ["Google Trends", "YouTube", "Social Score"]
+    assert bars["y"] == [60, 40, 70]
+    assert bars["marker"]["color"] == [
+        _COMPARISON_COLORS["Búsquedas"], _COMPARISON_COLORS["Contenido"], _COMPARISON_COLORS["Combinado"]
+    ]
+
+    # Leyenda: una traza vacía por tipo
+    assert [trace["name"] for trace in legend] == ["Búsquedas", "Contenido", "Combinado"]
+    assert all(trace["x"] == [None] for trace in legend)
+
+    layout = fig["layout"]
+    assert layout["uirevision"] == "compare" and layout["showlegend"] is True
+    assert layout["shapes"][0]["y0"] == 50
+
+    print("✅ _compute_comparison_chart devuelve una figura válida")
+
+
+def test_prepare_video_escaping():
+    """Test que los campos de la lista de videos salen escapados y sin URLs peligrosas"""
+    from types import SimpleNamespace
+    from components.social_media_panel import _prepare_video, _safe_url, _video_card_html
+
+    assert _safe_url("javascript:alert(1)") == ""
+    assert _safe_url(" JAVASCRIPT:alert(1)") == ""
+    assert _safe_url(None) == ""
+    assert _safe_url('https://img.example/a.jpg?x=1&y="2"') == "https://img.example/a.jpg?x=1&amp;y=&quot;2&quot;"
+
+    video = SimpleNamespace(
+        title="<script>alert('x')</script>" + "a" * 60,
+        link="javascript:alert(1)",
+        thumbnail="https://i.ytimg.com/vi/abc/hq.jpg",
+        views=1500,
+        channel='Canal "<b>"',
+        published="hace <2> días"
+    )
+    prepared = _prepare_video(video)
+
+    assert prepared.title.startswith("&lt;script&gt;alert(&#x27;x&#x27;)&lt;/script&gt;")
+    assert prepared.title.endswith("...")
+    assert prepared.link == "", "Los enlaces javascript: deberían descartarse"
+    assert prepared.thumbnail == "https://i.ytimg.com/vi/abc/hq.jpg"
+    assert prepared.views == "1500"
+    assert prepared.channel == "Canal &quot;&lt;b&gt;&quot;"
+    assert prepared.published == "hace &lt;2&gt; días"
+
+    card = _video_card_html(prepared)
+    assert "<script>" not in card and "href=" not in card
+
+    # Campos opcionales ausentes
+    minimal = _prepare_video(SimpleNamespace(title="Video", views=10))
+    assert (minimal.link, minimal.thumbnail, minimal.channel, minimal.published) == ("", "", "", "")
+
+    print("✅ _prepare_video escapa los campos y descarta URLs no http(s)")
+
+
+def test_html_escape_helper():
+    """Test que _esc escapa igual que html.escape(quote=True)"""
+    import html
+    from components.social_media_panel import _esc
+
+    samples = ["", "Canal normal", "Tom & Jerry", "<b>x</b>", "\"comillas\" y 'simples'", "ñandú 📺 <&>"]
+    for text in samples:
+        assert _esc(text) == html.escape(text), f"_esc({text!r}) difiere de html.escape"
+
+    print("✅ _esc equivale a html.escape")
+
+
+def test_perplexity_stream_parsing():
+    """Test parser SSE de Perplexity (keep-alive, choices vacío y [DONE])"""
+    from unittest import mock
+    from modules.providers.perplexity_provider import PerplexityProvider
+
+    lines = [
+        ": keep-alive",
+        "",
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        'data: {"choices": [{"delta": {"content": "Tendencia "}}]}',
+        "data: {\"choices\": []}",
+        ": keep-alive",
+        'data: {"choices": [{"delta": {"content": "al alza"}}]}',
+        "data: no-es-json",
+        'data:{"choices": [{"delta": {"content": "."}}]}',
+        "data: [DONE]",
+        'data: {"choices": [{"delta": {"content": "no debería salir"}}]}',
+    ]
+
+    class FakeResponse:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_lines(self, decode_unicode=False):
+            return iter(lines)
+
+    provider = PerplexityProvider(api_key="pplx-test")
+    with mock.patch(
+        "modules.providers.perplexity_provider.requests.post", return_value=FakeResponse()
+    ) as post:
+        chunks = list(provider.analyze_trend_stream({"keyword": "mini pc"}))
+
+    assert chunks == ["Tendencia ", "al alza", "."], chunks
+    assert post.call_args.kwargs["stream"] is True
+    assert post.call_args.kwargs["json"]["stream"] is True
+
+    print("✅ PerplexityProvider.analyze_trend_stream parsea el SSE")
+
+
+def _check(test) -> bool:
+    """Ejecuta un test basado en assert y devuelve si pasó (para run_all_tests)"""
+    try:
+        test()
+    except AssertionError as e:
+        print(f"❌ {test.__name__}: {e}")
+        return False
+    return True
+
+
 def run_all_tests():
     """Ejecuta todos los tests"""
     print("\n" + "="*50)
@@ -217,6 +480,15 @@ def run_all_tests():
     results.append(("Scoring Engine", test_scoring_engine()))
     results.append(("Growth Rate", test_growth_rate_calculation()))
     results.append(("Product Analyzer", test_product_analyzer()))
+    results.append(("Multi Country Order", _check(test_multi_country_order)))
+    results.append(("Analysis Cache", _check(test_store_analysis_eviction)))
+    results.append(("Merge Related Queries", _check(test_merge_related_queries)))
+    results.append(("Timeline Values", _check(test_timeline_values_reuse)))
+    results.append(("Format Number", _check(test_format_number)))
+    results.append(("Comparison Chart", _check(test_comparison_chart_payload)))
+    results.append(("Video Escaping", _check(test_prepare_video_escaping)))
+    results.append(("HTML Escape", _check(test_html_escape_helper)))
+    results.append(("Perplexity Stream", _check(test_perplexity_stream_parsing)))
 
     print("\n" + "="*50)
     print("📊 RESULTADOS")
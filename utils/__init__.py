@@ -306,7 +306,9 @@ def init_session_state():
         "show_volume_estimate": False,
         "ai_provider": "claude",
         "show_trajectory": True,
-        "api_connection_status": {}
+        "api_connection_status": {},
+        "analysis_cache": {},
+        "refresh_nonces": {}
     }
 
     for key, value in defaults.items():
@@ -5,6 +5,7 @@ Funciones de utilidad compartidas para evitar duplicación de código
 Nota: Este módulo reexporta funciones de validation.py para evitar duplicaciones.
 """
 
+from functools import lru_cache
 from typing import Union
 
 # Importar funciones de validation.py para evitar duplicación
@@ -18,10 +19,27 @@ from .validation import (
 )
 
 
+# Escalas de format_number, de mayor a menor
+_NUMBER_SCALES = (
+    (1_000_000_000, "B"),
+    (1_000_000, "M"),
+    (1_000, "K")
+)
+
+
+# Caché a nivel de proceso: la comparten todas las sesiones del servidor
+FORMAT_NUMBER_CACHE_SIZE = 10_000
+
+
+@lru_cache(maxsize=FORMAT_NUMBER_CACHE_SIZE)
 def format_number(num: Union[int, float]) -> str:
     """
     Formatea número de forma legible (K, M, B)
 
+    Cacheado: los mismos conteos (vistas, videos) se formatean en cada rerun
+    y entre sesiones. No usa st.cache_data: hashear los argumentos cuesta más
+    que formatear el número.
+
     Args:
         num: Número a formatear
 
@@ -36,12 +54,9 @@ def format_number(num: Union[int, float]) -> str:
     except (ValueError, TypeError):
         return "0"
 
-    if num >= 1_000_000_000:
-        return f"{num / 1_000_000_000:.1f}B"
-    elif num >= 1_000_000:
-        return f"{num / 1_000_000:.1f}M"
-    elif num >= 1_000:
-        return f"{num / 1_000:.1f}K"
+    for threshold, suffix in _NUMBER_SCALES:
+        if num >= threshold:
+            return f"{num / threshold:.1f}{suffix}"
     return str(int(num))
 
 
@@ -0,0 +1,43 @@
+"""
+Cliente HTTP compartido
+Una sola sesión de requests con keep-alive para todas las llamadas a SerpAPI
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+import streamlit as st
+
+
+# Análisis (usuarios) que pueden usar la sesión compartida a la vez sin
+# desbordar el pool; por encima, urllib3 descarta las conexiones sobrantes
+# ("Connection pool is full") y se pierde el keep-alive
+HTTP_CONCURRENT_ANALYSES = 4
+
+
+def create_http_session(pool_size: int) -> requests.Session:
+    """
+    Crea una sesión HTTP que reutiliza conexiones TCP/TLS
+
+    Args:
+        pool_size: Conexiones máximas por host
+
+    Returns:
+        requests.Session configurada
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_session(connections_per_analysis: int) -> requests.Session:
+    """
+    Sesión HTTP compartida entre módulos, reruns y sesiones
+
+    Args:
+        connections_per_analysis: Peticiones simultáneas de un análisis
+            (el pool se dimensiona para HTTP_CONCURRENT_ANALYSES análisis)
+    """
+    return create_http_session(connections_per_analysis * HTTP_CONCURRENT_ANALYSES)